@@ -0,0 +1,87 @@
+"""Compare the streaming document.xml DOCX extractor with the python-docx path.
+
+Run from the backend directory:
+
+    python -m benchmarks.docx_extraction --documents 50 --max-pages 6
+
+Each extractor runs in a fresh process so peak memory numbers don't bleed
+into each other. Reports documents per second, peak Python heap
+(tracemalloc) and resident-set growth, which also counts C-level allocations
+(expat behind xml.etree for document.xml, lxml for python-docx), plus text
+parity between the two outputs.
+"""
+import argparse
+import multiprocessing
+import time
+import tracemalloc
+
+from benchmarks.pdf_engines import parity
+from benchmarks.synthetic import docx_corpus
+
+EXTRACTORS = {
+    "document.xml": "extract_text_from_docx_xml",
+    "python-docx": "extract_text_from_docx",
+}
+
+
+def _max_rss_kb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(extractor_name, documents, max_pages, repeat, results):
+    from utils import resume_parser
+
+    extract = getattr(resume_parser, EXTRACTORS[extractor_name])
+    corpus = docx_corpus(documents=documents, max_pages=max_pages)
+    extract(corpus[0][1])  # warm imports before taking the memory baseline
+
+    rss_before = _max_rss_kb()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        texts = [extract(data) for _, data, _ in corpus]
+    elapsed = (time.perf_counter() - started) / repeat
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results[extractor_name] = {
+        "seconds": elapsed,
+        "docs_per_s": len(corpus) / elapsed,
+        "py_peak_kb": py_peak / 1024,
+        "rss_growth_kb": _max_rss_kb() - rss_before,
+        "texts": texts,
+    }
+
+
+def run(documents, max_pages, repeat):
+    manager = multiprocessing.Manager()
+    results = manager.dict()
+    for name in EXTRACTORS:
+        process = multiprocessing.Process(target=_measure, args=(name, documents, max_pages, repeat, results))
+        process.start()
+        process.join()
+        if name not in results:
+            print(f"{name}: failed (exit code {process.exitcode})")
+
+    print(f"Corpus: {documents} documents, up to {max_pages} pages each (note: tracemalloc slows both paths)")
+    print(f"{'extractor':<14} {'seconds':>9} {'docs/s':>9} {'py peak KB':>11} {'rss +KB':>9}")
+    for name, stats in results.items():
+        print(f"{name:<14} {stats['seconds']:>9.3f} {stats['docs_per_s']:>9.1f} "
+              f"{stats['py_peak_kb']:>11.0f} {stats['rss_growth_kb']:>9}")
+
+    if len(results) == 2:
+        fast, slow = results["document.xml"]["texts"], results["python-docx"]["texts"]
+        scores = [parity(a, b) for a, b in zip(slow, fast)]
+        print(f"\nText parity (mean / min token similarity): {sum(scores) / len(scores):.3f} / {min(scores):.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=30)
+    parser.add_argument("--max-pages", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.documents, args.max_pages, args.repeat)
@@ -0,0 +1,105 @@
+"""Throughput of the async Gemini client as the number of in-flight calls grows.
+
+Run from the backend directory:
+
+    python -m benchmarks.gemini_concurrency --latency-ms 200 --concurrency 1 4 16 64
+
+A local aiohttp stub answers generateContent after a fixed latency, standing
+in for the model. For each concurrency level the same number of prompts is
+sent by the async client (one shared session) and by the previous pattern
+(a blocking HTTP call per prompt on the event loop's default thread pool).
+With a fixed server latency, ideal throughput is concurrency / latency; the
+thread-pool path flattens out at the pool size.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import urllib.request
+
+from aiohttp import web
+
+from utils.gemini_client import AsyncGeminiClient
+
+MODEL = "models/stub"
+
+
+async def start_stub(latency):
+    async def generate(request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        prompt = body["contents"][0]["parts"][0]["text"]
+        return web.json_response({"candidates": [{"content": {"parts": [{"text": f"keywords for {prompt}"}]}}]})
+
+    app = web.Application()
+    app.router.add_post("/v1beta/models/{model}:generateContent", generate)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/v1beta"
+
+
+def blocking_generate(base_url, prompt):
+    """One synchronous HTTP call, as the SDK made on the default executor"""
+    body = json.dumps({"contents": [{"role": "user", "parts": [{"text": prompt}]}]}).encode()
+    request = urllib.request.Request(f"{base_url}/{MODEL}:generateContent", data=body,
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.load(response)["candidates"][0]["content"]["parts"][0]["text"]
+
+
+async def drive(call, total, concurrency):
+    """Send `total` prompts with at most `concurrency` in flight; (elapsed seconds, latencies)"""
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with gate:
+            started = time.perf_counter()
+            await call(f"prompt {i}")
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - started, latencies
+
+
+def describe(name, concurrency, total, elapsed, latencies):
+    latencies.sort()
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{name:<14} {concurrency:>5} {total / elapsed:>10.1f} "
+          f"{statistics.median(latencies) * 1000:>10.0f} {p95 * 1000:>10.0f}")
+
+
+async def run(latency_ms, levels, rounds):
+    runner, base_url = await start_stub(latency_ms / 1000)
+    client = AsyncGeminiClient(api_key="stub", model=MODEL, base_url=base_url, max_connections=max(levels))
+    loop = asyncio.get_running_loop()
+    try:
+        print(f"stub latency {latency_ms:.0f} ms, {rounds} rounds of prompts per level")
+        print(f"{'client':<14} {'in-flight':>5} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+        for concurrency in levels:
+            total = concurrency * rounds
+            elapsed, latencies = await drive(client.generate, total, concurrency)
+            describe("async", concurrency, total, elapsed, latencies)
+
+            async def threaded(prompt):
+                return await loop.run_in_executor(None, blocking_generate, base_url, prompt)
+
+            elapsed, latencies = await drive(threaded, total, concurrency)
+            describe("thread pool", concurrency, total, elapsed, latencies)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--rounds", type=int, default=5, help="prompts per in-flight slot")
+    args = parser.parse_args()
+    asyncio.run(run(args.latency_ms, args.concurrency, args.rounds))
@@ -0,0 +1,122 @@
+"""Compare the keyword matcher's two strategies with the previous per-keyword scan.
+
+Run from the backend directory:
+
+    python -m benchmarks.keyword_matching --resumes 20 --sizes 20 200 2000
+
+Reports milliseconds per resume for the legacy implementation (eight string
+variants and up to three regexes per keyword, each scanning the whole text),
+for the str.find scan and for the Aho–Corasick automaton, both warm
+(compiled once per job, as in /api/rank), and for the strategy
+match_keywords picks at that size, cold (including compilation). The
+crossover sets KEYWORD_SCAN_MAX_KEYWORDS. Agreement is the share of keyword
+decisions legacy and current make identically; the current matcher only
+accepts hits on word boundaries, so legacy substring hits such as "java"
+inside "javascript" are the expected differences.
+"""
+import argparse
+import random
+import re
+import time
+
+from benchmarks.synthetic import SKILLS, resume_lines
+from utils.documents import ResumeDocument
+from utils.keyword_matcher import KeywordMatcher, compile_keywords, match_keywords
+
+
+def legacy_find_matching_keywords(resume_doc, job_keywords):
+    """find_matching_keywords as it was before the automaton"""
+    resume_lower = resume_doc.normalized
+    resume_original = resume_doc.lower
+    matched = []
+    missing = []
+    for keyword in job_keywords:
+        keyword_clean = keyword.strip().lower()
+        if keyword_clean in resume_doc.tokens:
+            matched.append(keyword.strip())
+            continue
+        keyword_variants = [
+            keyword_clean,
+            keyword_clean.replace(' ', ''),
+            keyword_clean.replace('-', ' '),
+            keyword_clean.replace('_', ' '),
+            keyword_clean.replace('.', ''),
+            keyword_clean.replace('+', 'plus'),
+            keyword_clean.replace('#', 'sharp'),
+            keyword_clean.replace('&', 'and')
+        ]
+        exact_patterns = [
+            r'\b' + re.escape(keyword_clean) + r'\b',
+            r'\b' + re.escape(keyword_clean.replace(' ', '')) + r'\b' if ' ' in keyword_clean else None,
+            r'\b' + re.escape(keyword_clean.replace(' ', '-')) + r'\b' if ' ' in keyword_clean else None
+        ]
+        exact_patterns = [p for p in exact_patterns if p is not None]
+        found = any(variant in resume_lower or variant in resume_original for variant in keyword_variants)
+        if not found:
+            found = any(re.search(pattern, resume_original) for pattern in exact_patterns)
+        (matched if found else missing).append(keyword.strip())
+    return matched, missing
+
+
+def keyword_list(rng, size, vocabulary):
+    """Real skills, phrases from the resume vocabulary and keywords that never occur"""
+    keywords = list(SKILLS)
+    while len(keywords) < size:
+        roll = rng.random()
+        if roll < 0.4:
+            keywords.append(" ".join(rng.sample(vocabulary, 2)))
+        elif roll < 0.7:
+            keywords.append(rng.choice(vocabulary))
+        else:
+            keywords.append(f"{rng.choice(vocabulary)}-{rng.randint(0, 999)}")
+    rng.shuffle(keywords)
+    return keywords[:size]
+
+
+def _per_resume_ms(fn, documents, keywords):
+    started = time.perf_counter()
+    results = [fn(doc, keywords) for doc in documents]
+    return 1000 * (time.perf_counter() - started) / len(documents), results
+
+
+def run(resumes, lines, sizes, seed):
+    rng = random.Random(seed)
+    documents = [ResumeDocument.from_text("\n".join(resume_lines(rng, lines))) for _ in range(resumes)]
+    vocabulary = sorted({token for doc in documents for token in doc.tokens if len(token) > 3})
+    print(f"{resumes} resumes, {sum(len(doc.normalized) for doc in documents) // resumes} chars each on average")
+    print(f"{'keywords':>8} {'legacy ms':>10} {'scan ms':>9} {'automaton ms':>13} {'cold ms':>9} "
+          f"{'speedup':>8} {'agreement':>10}")
+
+    current_fn = lambda doc, keywords: tuple(match_keywords(doc.normalized, keywords, doc.tokens, all_spans=False)[:2])
+    for size in sizes:
+        keywords = keyword_list(rng, size, vocabulary)
+        legacy_ms, legacy = _per_resume_ms(legacy_find_matching_keywords, documents, keywords)
+
+        strategy_ms = {}
+        for name, scan_max in (("scan", size), ("automaton", 0)):
+            matcher = KeywordMatcher(keywords, scan_max_keywords=scan_max)
+            strategy_ms[name], _ = _per_resume_ms(
+                lambda doc, _: matcher.match(doc.normalized, doc.tokens, all_spans=False), documents, keywords)
+
+        compile_keywords.cache_clear()
+        started = time.perf_counter()
+        compile_keywords(tuple(keywords))
+        compile_ms = 1000 * (time.perf_counter() - started)
+        warm_ms, current = _per_resume_ms(current_fn, documents, keywords)
+        cold_ms = warm_ms + compile_ms / len(documents)
+
+        agree = sum(len(set(old[0]) & set(new[0])) + len(set(old[1]) & set(new[1]))
+                    for old, new in zip(legacy, current))
+        agreement = agree / (len(keywords) * len(documents))
+        print(f"{size:>8} {legacy_ms:>10.2f} {strategy_ms['scan']:>9.2f} {strategy_ms['automaton']:>13.2f} "
+              f"{cold_ms:>9.2f} {legacy_ms / warm_ms:>7.1f}x {agreement:>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--lines", type=int, default=120, help="lines per synthetic resume")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 200, 2000])
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+    run(args.resumes, args.lines, args.sizes, args.seed)
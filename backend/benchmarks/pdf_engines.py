@@ -0,0 +1,89 @@
+"""Compare PDF extraction engines on a synthetic resume corpus.
+
+Run from the backend directory:
+
+    python -m benchmarks.pdf_engines --documents 30 --max-pages 12
+
+Reports pages per second for every importable engine and how closely each
+engine's text matches the reference engine (token-level similarity).
+
+Extraction goes through the supervised process pool, as in the API; every
+worker is started (and has imported the engines) before anything is timed,
+so start-up is not charged to whichever engine runs first. Pass --in-process
+to time the engines without the pool (as with EXTRACTION_WORKERS=0).
+"""
+import argparse
+import difflib
+import re
+import time
+
+from benchmarks.synthetic import pdf_corpus
+from utils.extraction_pool import extraction_supervisor
+from utils.resume_parser import PDF_ENGINES, _probe_pdf, extract_pdf_with_engine
+
+
+def _tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def parity(reference, candidate):
+    """Similarity of two extractions on their word sequences (1.0 = identical)"""
+    return difflib.SequenceMatcher(None, _tokens(reference), _tokens(candidate), autojunk=False).ratio()
+
+
+def warm_pool(engine_name, pdf):
+    """Start every extraction worker with one task each, so no engine pays for spawning"""
+    tasks = [(engine_name, pdf, False)] * extraction_supervisor.workers
+    started = time.perf_counter()
+    list(extraction_supervisor.map(_probe_pdf, tasks))
+    return time.perf_counter() - started
+
+
+def run(documents, max_pages, repeat, parallel, in_process):
+    if in_process:
+        extraction_supervisor.workers = 0
+    corpus = pdf_corpus(documents=documents, max_pages=max_pages)
+    total_pages = sum(pages for _, _, pages in corpus)
+    engines = [name for name, engine in PDF_ENGINES.items() if engine.available]
+    print(f"Corpus: {len(corpus)} documents, {total_pages} pages; engines: {', '.join(engines)}")
+    if extraction_supervisor.enabled:
+        warmup_seconds = warm_pool(engines[0], corpus[0][1])
+        print(f"Extraction: process pool of {extraction_supervisor.workers} workers, "
+              f"started before timing ({warmup_seconds:.2f}s, not counted)")
+    else:
+        print("Extraction: in-process (no worker pool)")
+
+    outputs = {}
+    print(f"{'engine':<10} {'seconds':>9} {'pages/s':>9} {'failures':>9}")
+    for name in engines:
+        texts = []
+        failures = 0
+        started = time.perf_counter()
+        for _ in range(repeat):
+            texts = []
+            for _, pdf, _ in corpus:
+                try:
+                    texts.append(extract_pdf_with_engine(pdf, name, parallel=parallel))
+                except Exception:
+                    failures += 1
+                    texts.append("")
+        elapsed = (time.perf_counter() - started) / repeat
+        outputs[name] = texts
+        print(f"{name:<10} {elapsed:>9.3f} {total_pages / elapsed:>9.1f} {failures // repeat:>9}")
+
+    reference = "pypdf2" if "pypdf2" in outputs else engines[0]
+    print(f"\nText parity against {reference} (mean / min token similarity):")
+    for name, texts in outputs.items():
+        scores = [parity(ref, text) for ref, text in zip(outputs[reference], texts)]
+        print(f"{name:<10} {sum(scores) / len(scores):>6.3f} / {min(scores):.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--max-pages", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--parallel", action="store_true", help="use page-parallel extraction for long documents")
+    parser.add_argument("--in-process", action="store_true", help="extract in this process instead of the worker pool")
+    args = parser.parse_args()
+    run(args.documents, args.max_pages, args.repeat, args.parallel, args.in_process)
@@ -0,0 +1,153 @@
+"""Synthetic resume corpus used by the benchmark scripts.
+
+Documents are generated without any third-party dependency so every engine
+under test reads exactly the same bytes.
+"""
+import io
+import random
+import zipfile
+
+SECTION_TITLES = ["Summary", "Experience", "Projects", "Skills", "Education", "Certifications", "Publications"]
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Node.js", "SQL", "PostgreSQL", "MongoDB",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "Jenkins", "Git", "Linux", "Spark",
+    "Airflow", "Kafka", "TensorFlow", "PyTorch", "scikit-learn", "pandas", "NumPy", "FastAPI", "Django",
+    "Flask", "REST APIs", "GraphQL", "CI/CD", "Agile", "Scrum", "Jira", "Salesforce", "SAP", "Tableau",
+    "Power BI", "Excel", "machine learning", "data analysis", "project management", "microservices",
+]
+
+VERBS = ["Developed", "Led", "Designed", "Implemented", "Optimized", "Migrated", "Automated", "Delivered", "Built", "Reduced"]
+OBJECTS = ["a data pipeline", "the billing service", "an internal dashboard", "the onboarding flow",
+           "a recommendation engine", "the deployment process", "a reporting platform", "the search API"]
+RESULTS = ["cutting latency by {n}%", "saving {n} engineering hours per month", "serving {n}k daily users",
+           "improving conversion by {n}%", "reducing cloud spend by {n}%"]
+
+
+def resume_lines(rng, line_count):
+    """Plausible resume bullet lines"""
+    lines = []
+    while len(lines) < line_count:
+        if rng.random() < 0.12:
+            lines.append(rng.choice(SECTION_TITLES).upper())
+            continue
+        skills = ", ".join(rng.sample(SKILLS, 3))
+        result = rng.choice(RESULTS).format(n=rng.randint(5, 90))
+        lines.append(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {skills}, {result}.")
+    return lines
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages):
+    """Build a minimal text PDF; `pages` is a list of line lists"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_refs = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+        ops.extend(f"({_pdf_escape(line)}) '" for line in lines)
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        page_refs.append(len(objects))
+    kids = " ".join(f"{ref} 0 R" for ref in page_refs).encode()
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_refs)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref_at = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_at)
+    return bytes(out)
+
+
+def pdf_corpus(documents=20, min_pages=1, max_pages=12, lines_per_page=48, seed=7):
+    """Return a list of (name, pdf_bytes, page_count)"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(documents):
+        page_count = rng.randint(min_pages, max_pages)
+        pages = [resume_lines(rng, lines_per_page) for _ in range(page_count)]
+        corpus.append((f"resume_{i:03d}.pdf", make_pdf(pages), page_count))
+    return corpus
+
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+
+def _xml_escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _docx_paragraph(text, page_break=False):
+    run_break = '<w:r><w:br w:type="page"/></w:r>' if page_break else ""
+    return f'<w:p>{run_break}<w:r><w:t xml:space="preserve">{_xml_escape(text)}</w:t></w:r></w:p>'
+
+
+def make_docx(pages, table_rows=()):
+    """Build a minimal DOCX; `pages` is a list of line lists, `table_rows` a list of cell lists
+    rendered as a skills table at the end of the first page"""
+    body = []
+    for number, lines in enumerate(pages):
+        for i, line in enumerate(lines):
+            body.append(_docx_paragraph(line, page_break=number > 0 and i == 0))
+        if number == 0 and table_rows:
+            rows = "".join(
+                "<w:tr>" + "".join(f"<w:tc>{_docx_paragraph(cell)}</w:tc>" for cell in cells) + "</w:tr>"
+                for cells in table_rows
+            )
+            body.append(f"<w:tbl>{rows}</w:tbl>")
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _DOCX_RELS)
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def docx_corpus(documents=20, min_pages=1, max_pages=6, lines_per_page=40, seed=11):
+    """Return a list of (name, docx_bytes, page_count); every resume has a skills table"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(documents):
+        page_count = rng.randint(min_pages, max_pages)
+        pages = [resume_lines(rng, lines_per_page) for _ in range(page_count)]
+        table = [[title, ", ".join(rng.sample(SKILLS, 4))] for title in ("Languages", "Cloud", "Data", "Tools")]
+        corpus.append((f"resume_{i:03d}.docx", make_docx(pages, table), page_count))
+    return corpus
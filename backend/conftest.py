@@ -0,0 +1 @@
+# Makes the backend directory importable (utils.*) when pytest is run from here
@@ -1,13 +1,39 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from routes.match import router as match_router
+from utils.resume_parser import ResumeParseError
+from utils.upload import UploadSizeLimitMiddleware, MAX_RANK_BODY_BYTES
+from utils.warmup import warmup
+from utils.gemini_client import gemini_client
 
 app = FastAPI()
 
+@app.on_event("startup")
+async def start_warmup():
+    # Models load on a background thread so the server accepts requests
+    # (and answers /api/ready) immediately
+    warmup.start()
+
+@app.on_event("shutdown")
+async def close_clients():
+    await gemini_client.close()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to ResuMatch API"}
 
+@app.exception_handler(ResumeParseError)
+async def resume_parse_error_handler(request: Request, exc: ResumeParseError):
+    # `code` lets clients tell e.g. scanned or locked PDFs apart from other failures
+    return JSONResponse(status_code=422, content={"detail": str(exc), "code": exc.code})
+
 app.include_router(match_router, prefix="/api")
+
+# Refuse oversized uploads before the multipart body is read (added before
+# CORS so that rejections still carry CORS headers); batch ranking carries
+# many resumes, so it gets a larger body budget
+app.add_middleware(UploadSizeLimitMiddleware, path_limits={"/api/rank": MAX_RANK_BODY_BYTES})
+
 from fastapi.middleware.cors import CORSMiddleware
 
 app.add_middleware(
@@ -1,6 +1,24 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from utils.matcher import calculate_match
-from utils.resume_parser import extract_resume_text
+from typing import List
+import asyncio
+import json
+import time
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from utils.matcher import (
+    calculate_match, match_pipeline, scoring_pipeline, prepare_match_inputs, stream_suggestions, MIN_SUGGESTION_CHARS
+)
+from utils.ranking import rank_resumes, rank_jobs, RANK_MAX_RESUMES, RANK_MAX_SUGGESTIONS, MATCH_JOBS_MAX
+from utils.resume_parser import read_resume_text, ResumeParseError
+from utils.text_cache import resume_text_cache
+from utils.extraction_pool import extraction_supervisor
+from utils.warmup import warmup, ResourceNotReady
+from utils.inference import inference_executor, InferenceOverloaded
+from utils.embeddings import embedding_batcher, embedding_cache
+from utils.keyword_cache import job_keyword_cache
+from utils.singleflight import llm_calls
+from utils.upload import spool_upload
 import logging
 
 # Set up logging
@@ -9,6 +27,26 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+def ensure_models_ready():
+    """Fail fast while models are still loading instead of queueing the request"""
+    if not warmup.is_ready():
+        warmup.retry_failed()
+        raise models_loading()
+
+def models_loading():
+    return HTTPException(
+        status_code=503,
+        detail="ResuMatch is still starting up (loading analysis models). Please try again in a few seconds.",
+        headers={"Retry-After": "5"}
+    )
+
+def inference_busy():
+    return HTTPException(
+        status_code=503,
+        detail="ResuMatch is busy analysing other resumes. Please try again in a few seconds.",
+        headers={"Retry-After": "2"}
+    )
+
 @router.post("/upload-resume")
 async def upload_resume(
     file: UploadFile = File(...),
@@ -17,6 +55,8 @@ async def upload_resume(
     """
     Enhanced endpoint to handle resume and job description analysis with comprehensive error handling.
     """
+    ensure_models_ready()
+
     try:
         logger.info("=== STARTING RESUME ANALYSIS ===")
         logger.info(f"File: {file.filename}")
@@ -29,20 +69,33 @@ async def upload_resume(
         if len(job_description.strip()) < 50:
             raise HTTPException(status_code=400, detail="Job description too short (minimum 50 characters required)")
         
-        # Extract resume text
-        contents = await file.read()
-        logger.info(f"File size: {len(contents)} bytes")
-        
-        resume_text = extract_resume_text(contents, file.filename)
+        # Stream the upload in (size-capped) and extract resume text
+        upload = await spool_upload(file)
+        logger.info(f"File size: {upload.size} bytes ({'spooled to disk' if upload.path else 'in memory'})")
+
+        try:
+            # Parsing runs on the supervised extraction pool; waiting on it
+            # happens in a worker thread so the event loop stays free
+            resume_text, budget = await run_in_threadpool(read_resume_text, upload.source, file.filename, None, upload.digest)
+        finally:
+            upload.close()
         
         if not resume_text or len(resume_text.strip()) < 50:
             raise HTTPException(status_code=400, detail="Could not extract sufficient text from resume. Please ensure the file is readable and contains text content.")
         
-        logger.info(f"Extracted resume text length: {len(resume_text)}")
+        logger.info(f"Extracted resume text length: {len(resume_text)} ({budget.pages_read} pages)")
+        if budget.truncated_by:
+            logger.info(f"Resume text truncated by {budget.truncated_by} budget")
         
         # Calculate match with enhanced error handling
         try:
             result = await calculate_match(resume_text, job_description)
+        except InferenceOverloaded:
+            logger.warning("Inference queue full, rejecting request")
+            raise inference_busy()
+        except ResourceNotReady as rn:
+            logger.warning(f"Analysis model unavailable: {rn}")
+            raise models_loading()
         except ValueError as ve:
             logger.error(f"Validation error in matching: {ve}")
             raise HTTPException(status_code=400, detail=str(ve))
@@ -67,18 +120,309 @@ async def upload_resume(
             "similarity_score": result["similarity_score"],
             "matched_keywords": result["matched_keywords"],
             "missing_keywords": result["missing_keywords"],
-            "suggestion": result["suggestion"]
+            "suggestion": result["suggestion"],
+            "evidence": result["evidence"],
+            "extraction": budget.as_dict(),
+            "stage_timings_ms": result.get("stage_timings_ms", {})
         }
 
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
+    except ResumeParseError as pe:
+        # Handled in main.py so the response carries the error code
+        logger.warning(f"Resume rejected ({pe.code}): {pe}")
+        raise
     except Exception as e:
         logger.error(f"Unexpected error in processing: {str(e)}")
         logger.error(f"Error type: {type(e)}")
         raise HTTPException(status_code=500, detail="Internal server error during resume processing")
 
-def validate_and_enhance_results(result):
+# Payload of the event sent when a scoring stage finishes (every event also carries "ms")
+STREAM_STAGE_PAYLOADS = {
+    "keywords": lambda keywords: {"job_keywords": keywords},
+    "keyword_match": lambda match: {
+        "matched_keywords": clean_keywords(match[0], MAX_MATCHED_KEYWORDS),
+        "missing_keywords": clean_keywords(match[1], MAX_MISSING_KEYWORDS),
+    },
+    "alignment": lambda alignment: {"evidence": alignment[1]},
+    "score": lambda score: {"similarity_score": round(score, 1)},
+}
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _match_events(upload, filename, job_description):
+    """Server-sent events for one resume analysis, in the order results become available"""
+    started = time.perf_counter()
+    try:
+        try:
+            resume_text, budget = await run_in_threadpool(read_resume_text, upload.source, filename, None, upload.digest)
+        finally:
+            upload.close()
+        if not resume_text or len(resume_text.strip()) < 50:
+            yield sse_event("error", {"status": 400, "detail": "Could not extract sufficient text from resume. Please ensure the file is readable and contains text content."})
+            return
+        parse_ms = round(1000 * (time.perf_counter() - started), 1)
+        yield sse_event("parse", {"ms": parse_ms, "characters": len(resume_text), "extraction": budget.as_dict()})
+
+        # Scoring stages report through a queue as they finish
+        inputs = prepare_match_inputs(resume_text, job_description)
+        finished = asyncio.Queue()
+        run = asyncio.ensure_future(scoring_pipeline.run(
+            inputs, on_stage=lambda name, value, ms: finished.put_nowait((name, value, ms))
+        ))
+        run.add_done_callback(lambda _: finished.put_nowait(None))
+        try:
+            while True:
+                item = await finished.get()
+                if item is None:
+                    break
+                name, value, ms = item
+                payload = STREAM_STAGE_PAYLOADS.get(name, lambda _: {})(value)
+                yield sse_event(name, {"ms": ms, **payload})
+            results, timings = run.result()
+        finally:
+            run.cancel()
+
+        matched_keywords, missing_keywords = results["keyword_match"]
+        suggestion_started = time.perf_counter()
+        parts = []
+        async for text in stream_suggestions(job_description, resume_text, results["score"], matched_keywords, missing_keywords):
+            parts.append(text)
+            yield sse_event("suggestion", {"text": text})
+
+        timings = {"parse": parse_ms, **timings, "suggestions": round(1000 * (time.perf_counter() - suggestion_started), 1)}
+        timings["total"] = round(1000 * (time.perf_counter() - started), 1)
+        result = validate_and_enhance_results({
+            "similarity_score": round(results["score"], 1),
+            "matched_keywords": matched_keywords,
+            "missing_keywords": missing_keywords,
+            "suggestion": "".join(parts),
+            "evidence": results["alignment"][1],
+        }, require_suggestion=False)
+        # Every attempt came back short; the client already has the text
+        result["suggestion_incomplete"] = len(result["suggestion"].strip()) < MIN_SUGGESTION_CHARS
+        yield sse_event("done", {**result, "extraction": budget.as_dict(), "stage_timings_ms": timings})
+
+    except InferenceOverloaded:
+        logger.warning("Inference queue full, ending analysis stream")
+        yield sse_event("error", {"status": 503, "detail": inference_busy().detail})
+    except ResourceNotReady as rn:
+        logger.warning(f"Analysis model unavailable: {rn}")
+        yield sse_event("error", {"status": 503, "detail": models_loading().detail})
+    except ResumeParseError as pe:
+        logger.warning(f"Resume rejected ({pe.code}): {pe}")
+        yield sse_event("error", {"status": 422, "detail": str(pe), "code": pe.code})
+    except ValueError as ve:
+        logger.error(f"Validation error in matching: {ve}")
+        yield sse_event("error", {"status": 400, "detail": str(ve)})
+    except Exception as e:
+        logger.error(f"Error in streamed analysis: {e}")
+        yield sse_event("error", {"status": 500, "detail": "Unable to process resume analysis. Please try again."})
+
+@router.post("/upload-resume/stream")
+async def upload_resume_stream(
+    file: UploadFile = File(...),
+    job_description: str = Form(...)
+):
+    """
+    /upload-resume as server-sent events: "parse", then one event per scoring
+    stage as it finishes (keywords, keyword_match, score, alignment...), the
+    suggestions as "suggestion" text pieces, and finally "done" with the same
+    result /upload-resume returns, plus "suggestion_incomplete" when every
+    attempt produced less than MIN_SUGGESTION_CHARS. Failures after the
+    stream has started arrive as an "error" event carrying the HTTP status.
+    """
+    ensure_models_ready()
+
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    
+    if len(job_description.strip()) < 50:
+        raise HTTPException(status_code=400, detail="Job description too short (minimum 50 characters required)")
+    
+    # Size limits are enforced before the stream starts, so they stay HTTP errors
+    upload = await spool_upload(file)
+    logger.info(f"=== STREAMING RESUME ANALYSIS === File: {file.filename} ({upload.size} bytes)")
+
+    # The generator closes the upload once parsed; the background task also
+    # runs when the body was never iterated (close() is idempotent)
+    return StreamingResponse(
+        _match_events(upload, file.filename, job_description),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(upload.close)
+    )
+
+async def _read_candidate(file, parse_slots):
+    """Spool and parse one resume of a ranking request; returns (text, error)"""
+    async with parse_slots:
+        try:
+            upload = await spool_upload(file)
+            try:
+                resume_text, _ = await run_in_threadpool(read_resume_text, upload.source, file.filename, None, upload.digest)
+            finally:
+                upload.close()
+        except ResumeParseError as pe:
+            return None, {"detail": str(pe), "code": pe.code}
+        except HTTPException as he:
+            return None, {"detail": he.detail, "code": "upload_rejected"}
+        except Exception as e:
+            logger.error(f"Unexpected error reading {file.filename}: {e}")
+            return None, {"detail": "Could not read this file", "code": "extraction_failed"}
+
+    if not resume_text or len(resume_text.strip()) < 50:
+        return None, {"detail": "Could not extract sufficient text from resume", "code": "insufficient_text"}
+    return resume_text, None
+
+@router.post("/rank")
+async def rank(
+    files: List[UploadFile] = File(...),
+    job_description: str = Form(...),
+    top_k: int = Form(0)
+):
+    """
+    Rank many resumes against one job description, best match first.
+    LLM suggestions are generated only for the `top_k` best candidates.
+    """
+    ensure_models_ready()
+
+    if len(job_description.strip()) < 50:
+        raise HTTPException(status_code=400, detail="Job description too short (minimum 50 characters required)")
+    if not files:
+        raise HTTPException(status_code=400, detail="No files uploaded")
+    if len(files) > RANK_MAX_RESUMES:
+        raise HTTPException(status_code=400, detail=f"Too many resumes (maximum {RANK_MAX_RESUMES} per request)")
+    if not 0 <= top_k <= RANK_MAX_SUGGESTIONS:
+        raise HTTPException(status_code=400, detail=f"top_k must be between 0 and {RANK_MAX_SUGGESTIONS}")
+
+    logger.info(f"=== RANKING {len(files)} RESUMES (suggestions for top {top_k}) ===")
+
+    # Parse concurrently, but never queue more documents than the extraction
+    # pool can work on at once
+    parse_slots = asyncio.Semaphore(max(1, extraction_supervisor.workers))
+    parsed = await asyncio.gather(*(_read_candidate(file, parse_slots) for file in files))
+
+    candidates = []
+    failed = []
+    for index, (file, (text, error)) in enumerate(zip(files, parsed)):
+        if error:
+            failed.append({"index": index, "filename": file.filename, **error})
+        else:
+            candidates.append(((index, file.filename), text))
+
+    try:
+        ranking = await rank_resumes(candidates, job_description, top_k)
+    except InferenceOverloaded:
+        logger.warning("Inference queue full, rejecting ranking request")
+        raise inference_busy()
+    except Exception as e:
+        logger.error(f"Error in ranking calculation: {e}")
+        raise HTTPException(status_code=500, detail="Unable to rank resumes. Please try again.")
+
+    results = []
+    for result in ranking["results"]:
+        index, filename = result.pop("name")
+        results.append({"index": index, "filename": filename, **result})
+
+    logger.info(f"Ranked {len(results)} resumes, {len(failed)} could not be read")
+    return {
+        "job_keywords": ranking["job_keywords"],
+        "results": results,
+        "failed": failed
+    }
+
+@router.post("/match-jobs")
+async def match_jobs(
+    file: UploadFile = File(...),
+    job_descriptions: List[str] = Form(...),
+    suggest_for: List[int] = Form([])
+):
+    """
+    Rank many job descriptions for one resume, best match first.
+    The resume is parsed and embedded once; LLM suggestions are generated
+    only for the job indices listed in `suggest_for`.
+    """
+    ensure_models_ready()
+
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file uploaded")
+    if not job_descriptions:
+        raise HTTPException(status_code=400, detail="No job descriptions provided")
+    if len(job_descriptions) > MATCH_JOBS_MAX:
+        raise HTTPException(status_code=400, detail=f"Too many job descriptions (maximum {MATCH_JOBS_MAX} per request)")
+    for index, job_description in enumerate(job_descriptions):
+        if len(job_description.strip()) < 50:
+            raise HTTPException(status_code=400, detail=f"Job description {index} too short (minimum 50 characters required)")
+    if len(set(suggest_for)) > RANK_MAX_SUGGESTIONS:
+        raise HTTPException(status_code=400, detail=f"Suggestions can be requested for at most {RANK_MAX_SUGGESTIONS} jobs")
+    if any(not 0 <= index < len(job_descriptions) for index in suggest_for):
+        raise HTTPException(status_code=400, detail="suggest_for contains an unknown job index")
+
+    logger.info(f"=== MATCHING {file.filename} AGAINST {len(job_descriptions)} JOBS ===")
+
+    upload = await spool_upload(file)
+    try:
+        resume_text, budget = await run_in_threadpool(read_resume_text, upload.source, file.filename, None, upload.digest)
+    finally:
+        upload.close()
+
+    if not resume_text or len(resume_text.strip()) < 50:
+        raise HTTPException(status_code=400, detail="Could not extract sufficient text from resume. Please ensure the file is readable and contains text content.")
+
+    try:
+        results = await rank_jobs(resume_text, job_descriptions, suggest_for)
+    except InferenceOverloaded:
+        logger.warning("Inference queue full, rejecting multi-job request")
+        raise inference_busy()
+    except Exception as e:
+        logger.error(f"Error in multi-job matching: {e}")
+        raise HTTPException(status_code=500, detail="Unable to match resume against these jobs. Please try again.")
+
+    return {
+        "results": results,
+        "extraction": budget.as_dict()
+    }
+
+@router.get("/ready")
+async def readiness():
+    """Readiness probe: 200 once the embedding model and the TF-IDF model are loaded"""
+    status = warmup.readiness()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """Hit/miss counters for the server-side caches"""
+    return {
+        "resume_text": resume_text_cache.stats(),
+        "sentence_embeddings": embedding_cache.stats(),
+        "job_keywords": job_keyword_cache.stats(),
+        "extraction_pool": extraction_supervisor.stats()
+    }
+
+@router.get("/metrics")
+async def metrics():
+    """Queue depth and wait/run times of the inference executor, embedding batch sizes,
+    coalesced LLM calls and per-stage latency of the match pipelines"""
+    return {
+        "inference": inference_executor.stats(),
+        "embedding_batcher": embedding_batcher.stats(),
+        "llm_singleflight": llm_calls.stats(),
+        "match_pipeline": match_pipeline.stats(),
+        "scoring_pipeline": scoring_pipeline.stats()
+    }
+
+# How many keywords of each kind a result carries
+MAX_MATCHED_KEYWORDS = 15
+MAX_MISSING_KEYWORDS = 10
+
+def clean_keywords(keywords, limit):
+    """Stripped, non-empty keywords without duplicates, first occurrence first, at most `limit`"""
+    return list(dict.fromkeys(kw.strip() for kw in keywords if kw.strip()))[:limit]
+
+def validate_and_enhance_results(result, require_suggestion=True):
     """Validate and enhance the results before sending to frontend"""
     
     # Ensure similarity score is reasonable
@@ -93,12 +437,17 @@ def validate_and_enhance_results(result):
     if not isinstance(result.get("missing_keywords"), list):
         result["missing_keywords"] = []
     
+    # Requirement-to-evidence pairs are optional
+    if not isinstance(result.get("evidence"), list):
+        result["evidence"] = []
+    
     # Clean up keywords (remove empty strings, duplicates)
-    result["matched_keywords"] = list(set([kw.strip() for kw in result["matched_keywords"] if kw.strip()]))[:15]
-    result["missing_keywords"] = list(set([kw.strip() for kw in result["missing_keywords"] if kw.strip()]))[:10]
+    result["matched_keywords"] = clean_keywords(result["matched_keywords"], MAX_MATCHED_KEYWORDS)
+    result["missing_keywords"] = clean_keywords(result["missing_keywords"], MAX_MISSING_KEYWORDS)
     
     # Ensure suggestions exist and are substantial
-    if not result.get("suggestion") or len(result["suggestion"].strip()) < 200:
+    # (a streamed suggestion has already reached the client either way)
+    if require_suggestion and (not result.get("suggestion") or len(result["suggestion"].strip()) < MIN_SUGGESTION_CHARS):
         logger.warning("Insufficient suggestions received")
         raise Exception("AI suggestions generation failed")
     
@@ -0,0 +1,39 @@
+import threading
+import time
+
+import pytest
+
+from utils.extraction_pool import ExtractionSupervisor, ExtractionTimeout
+
+
+def slow_square(value, seconds):
+    time.sleep(seconds)
+    return value * value
+
+
+def test_map_resubmits_tasks_lost_when_another_document_recycles_the_pool():
+    supervisor = ExtractionSupervisor(workers=3, memory_limit_mb=0)
+    try:
+        supervisor.call(slow_square, 0, 0)  # start the workers before timing anything
+        # Another document overruns its deadline while our ranges are running
+        # or queued, which kills the pool they were submitted to
+        errors = []
+        def overrunning_document():
+            try:
+                supervisor.call(slow_square, 0, 30, deadline=time.monotonic() + 0.3)
+            except ExtractionTimeout as e:
+                errors.append(e)
+        other = threading.Thread(target=overrunning_document)
+        other.start()
+        time.sleep(0.1)
+
+        results = list(supervisor.map(slow_square, [(value, 0.5) for value in range(4)], time.monotonic() + 20))
+        other.join()
+
+        assert results == [0, 1, 4, 9]
+        assert len(errors) == 1
+        assert supervisor.stats()["recycles"] == 1
+    finally:
+        pool = supervisor._pool
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+import time
+
+from utils.keyword_cache import KeywordCache
+
+
+def test_disk_tier_stays_off_the_event_loop(tmp_path):
+    cache = KeywordCache(path=str(tmp_path / "keywords.sqlite3"))
+
+    async def scenario():
+        cache.put_nowait("cached", ["python", "sql"])
+        await asyncio.sleep(0.1)  # let the write land
+
+        # Another worker holds the database, as a contended write would
+        release = threading.Event()
+        holder = threading.Thread(target=lambda: cache._db_lock.acquire() and release.wait(5) and cache._db_lock.release())
+        holder.start()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while not release.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.ensure_future(ticker())
+        lookup = asyncio.ensure_future(cache.get_async("not cached"))
+        started = time.monotonic()
+        assert await cache.get_async("cached") == ["python", "sql"]
+        assert time.monotonic() - started < 0.05  # memory hits never wait for SQLite
+        await asyncio.sleep(0.3)
+        release.set()
+        assert await lookup is None
+        await ticking
+        holder.join()
+        return ticks
+
+    assert asyncio.run(scenario()) >= 20
+    assert KeywordCache(path=cache.path).get("cached") == ["python", "sql"]
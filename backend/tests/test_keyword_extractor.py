@@ -0,0 +1,31 @@
+from utils.keyword_extractor import extract_local_keywords, gazetteer_skills
+from utils.documents import preprocess_text
+
+RECRUITING_JD = """We're hiring a Senior Data Scientist to join our R&D group. You will present results to the C-suite
+and go the extra mile for customers. Go the extra mile! If plan A fails, we always have a Plan C customers can rely on.
+Requirements: 5+ years of experience with Python and SQL. Experience with machine learning, TensorFlow and AWS."""
+
+
+def skills_in(text):
+    return set(gazetteer_skills(text, preprocess_text(text)))
+
+
+def test_single_letter_languages_need_a_language_context():
+    assert not {"c", "r", "go"} & skills_in("Our R&D team reports to the C-suite. We have a Plan C. Go the extra mile.")
+    assert {"c", "r"} <= skills_in("Strong C/C++ skills and statistical modelling in R.")
+    assert {"r", "c"} <= skills_in("Languages: Python, R, Java, C.")
+    assert "go" in skills_in("Build backend services in Go on Kubernetes.")
+    assert "c" in skills_in("Embedded C programming on ARM.")
+
+
+def test_single_letter_terms_do_not_match_inside_compounds():
+    assert not {"c", "r"} & skills_in("R&D budget, C-suite reporting, A/B and C/D testing, R-squared.")
+
+
+def test_recruiting_filler_is_not_a_keyword():
+    keywords = extract_local_keywords(RECRUITING_JD)
+    for junk in ("c", "r", "go", "hiring", "we're hiring", "results", "present results", "extra mile",
+                 "plan c customers", "c-suite"):
+        assert junk not in keywords
+    for skill in ("python", "sql", "machine learning", "tensorflow", "aws"):
+        assert skill in keywords
@@ -0,0 +1,52 @@
+import pytest
+
+from utils.documents import preprocess_text
+from utils.keyword_matcher import KEYWORD_SCAN_MAX_KEYWORDS, KeywordMatcher
+
+RESUME = preprocess_text("Designed REST APIs and relational databases; JavaScript front end, CI/CD pipelines.")
+KEYWORDS = ["api", "database", "java", "ci-cd", "kubernetes"]
+# Repeats "api" so first-hit and all-span matching differ
+PLURAL_RESUME = preprocess_text("Built REST APIs behind an API gateway and tuned Postgres databases; wrote CI/CD pipelines.")
+
+
+def test_scan_and_automaton_agree():
+    for scan_max in (len(KEYWORDS), 0):
+        result = KeywordMatcher(KEYWORDS, scan_max_keywords=scan_max).match(RESUME)
+        assert result.matched == ["api", "database", "ci-cd"]
+        assert result.missing == ["java", "kubernetes"]
+
+
+def test_plural_suffix_is_part_of_the_span():
+    result = KeywordMatcher(["api"]).match(RESUME)
+    (start, end), = result.offsets["api"]
+    assert RESUME[start:end] == "apis"
+
+
+def _padded_keywords(size):
+    """KEYWORDS followed by keywords that never occur, `size` in all"""
+    return KEYWORDS + [f"absent-skill-{i}" for i in range(size - len(KEYWORDS))]
+
+
+@pytest.mark.parametrize("size", [KEYWORD_SCAN_MAX_KEYWORDS, KEYWORD_SCAN_MAX_KEYWORDS + 1])
+def test_plural_spans_at_the_threshold(size):
+    matcher = KeywordMatcher(_padded_keywords(size))
+    assert (matcher._automaton is None) == (size <= KEYWORD_SCAN_MAX_KEYWORDS)
+
+    result = matcher.match(PLURAL_RESUME)
+    assert result.matched == ["api", "database", "ci-cd"]
+    assert [PLURAL_RESUME[start:end] for start, end in result.offsets["api"]] == ["apis", "api"]
+    assert [PLURAL_RESUME[start:end] for start, end in result.offsets["database"]] == ["databases"]
+
+
+@pytest.mark.parametrize("size", [KEYWORD_SCAN_MAX_KEYWORDS, KEYWORD_SCAN_MAX_KEYWORDS + 1])
+def test_first_hit_only_at_the_threshold(size):
+    matcher = KeywordMatcher(_padded_keywords(size))
+    tokens = frozenset(PLURAL_RESUME.split())
+    every = matcher.match(PLURAL_RESUME, tokens)
+    first = matcher.match(PLURAL_RESUME, tokens, all_spans=False)
+
+    assert first.matched == every.matched
+    assert first.missing == every.missing
+    for keyword, spans in first.offsets.items():
+        assert len(spans) == 1
+        assert spans[0] in every.offsets[keyword]
@@ -0,0 +1,63 @@
+import asyncio
+import hashlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+pytest.importorskip("sklearn")
+
+from utils import matcher, ranking
+from utils.tfidf_model import HashingTfModel
+
+JOB = """Requirements: five years of Python and SQL in production. Experience running data pipelines on AWS.
+Nice to have: Kafka and Airflow. You will own the ingestion platform end to end."""
+RESUME = """Data engineer with eight years of Python and SQL experience. Built streaming pipelines on AWS with Kafka.
+Migrated batch jobs to Airflow and cut run times in half."""
+# Keyword lists: no sentence longer than 20 characters
+JOB_WITHOUT_SENTENCES = "Python. SQL. AWS. Kafka. Airflow. Spark. Docker. Terraform. Linux."
+RESUME_WITHOUT_SENTENCES = "Python. SQL. Airflow. Docker. Kubernetes. Linux. Bash. Git. Jenkins."
+
+
+async def fake_embed_sentences(texts):
+    """Deterministic unit vectors, one per text, in place of the sentence model"""
+    rows = []
+    for text in texts:
+        seed = int(hashlib.sha256(text.encode()).hexdigest()[:8], 16)
+        vector = np.random.default_rng(seed).normal(size=32).astype(np.float32)
+        rows.append(vector / np.linalg.norm(vector))
+    return np.vstack(rows)
+
+
+async def fake_keywords(job_description, *args, **kwargs):
+    return ["python", "sql", "aws", "kafka", "airflow"]
+
+
+@pytest.fixture(autouse=True)
+def offline_models(monkeypatch):
+    model = HashingTfModel()
+    monkeypatch.setattr(matcher, "get_tfidf_model", lambda: model)
+    for module in (matcher, ranking):
+        monkeypatch.setattr(module, "embed_sentences", fake_embed_sentences)
+        monkeypatch.setattr(module, "extract_dynamic_keywords", fake_keywords)
+
+
+def upload_resume_score(resume, job):
+    results, _ = asyncio.run(matcher.scoring_pipeline.run(matcher.prepare_match_inputs(resume, job)))
+    return round(results["score"], 1)
+
+
+@pytest.mark.parametrize("resume, job", [
+    (RESUME_WITHOUT_SENTENCES, JOB),
+    (RESUME, JOB_WITHOUT_SENTENCES),
+    (RESUME_WITHOUT_SENTENCES, JOB_WITHOUT_SENTENCES),
+    (RESUME, JOB),
+])
+def test_ranking_endpoints_score_a_pair_like_upload_resume(resume, job):
+    expected = upload_resume_score(resume, job)
+    ranked = asyncio.run(ranking.rank_resumes([("candidate", resume)], job))["results"][0]
+    matched = asyncio.run(ranking.rank_jobs(resume, [job, JOB + " Go experience."]))
+    matched = next(result for result in matched if result["index"] == 0)
+
+    assert ranked["similarity_score"] == pytest.approx(expected, abs=0.1)
+    assert matched["similarity_score"] == pytest.approx(expected, abs=0.1)
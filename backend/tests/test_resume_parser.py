@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip("PyPDF2")
+pytest.importorskip("docx")
+
+from utils import resume_parser
+from utils.extraction_pool import extraction_supervisor
+from utils.resume_parser import ResumeParseError, extract_text_from_pdf
+
+CORRUPT_PDF = b"%PDF-1.4\n" + bytes(range(256)) * 4
+
+
+def test_unreadable_pdf_is_prechecked_once_and_rejected_with_a_code(monkeypatch):
+    monkeypatch.setattr(extraction_supervisor, "workers", 0)
+    prechecks = []
+    precheck = resume_parser.precheck_pdf
+    monkeypatch.setattr(resume_parser, "precheck_pdf", lambda source, *args: prechecks.append(1) or precheck(source, *args))
+
+    with pytest.raises(ResumeParseError) as error:
+        extract_text_from_pdf(CORRUPT_PDF)
+
+    assert error.value.code == "unreadable_pdf"
+    assert len(prechecks) == 1
+    assert len(resume_parser.available_pdf_engines()) > 1
@@ -0,0 +1,41 @@
+import asyncio
+
+from utils.singleflight import SingleFlight
+
+
+async def slow_echo(value):
+    await asyncio.sleep(0.05)
+    return value
+
+
+def test_caller_joining_after_the_last_waiter_cancelled_starts_a_new_flight():
+    async def scenario():
+        flights = SingleFlight()
+        first = asyncio.ensure_future(flights.run("key", slow_echo, "first"))
+        await asyncio.sleep(0)  # first is now waiting on the shared call
+        first.cancel()
+        # first's cancellation runs (and cancels the shared call) before we
+        # resume, but the shared call has not finished cancelling yet
+        await asyncio.sleep(0)
+        second = await flights.run("key", slow_echo, "second")
+        assert first.cancelled()
+        return second, flights.stats()
+
+    result, stats = asyncio.run(scenario())
+    assert result == "second"
+    assert stats["upstream_calls"] == 2
+    assert stats["in_flight"] == 0
+
+
+def test_callers_share_one_call_and_survive_one_of_them_cancelling():
+    async def scenario():
+        flights = SingleFlight()
+        first = asyncio.ensure_future(flights.run("key", slow_echo, "shared"))
+        second = asyncio.ensure_future(flights.run("key", slow_echo, "shared"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, flights.stats()
+
+    result, stats = asyncio.run(scenario())
+    assert result == "shared"
+    assert stats["upstream_calls"] == 1
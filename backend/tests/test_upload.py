@@ -0,0 +1,63 @@
+import asyncio
+import hashlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+from starlette.datastructures import UploadFile
+
+from utils.upload import spool_upload
+
+BODY = b"%PDF-1.4 resume body " * 200
+
+
+def test_upload_starlette_spooled_to_disk_is_read_in_place():
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024)
+    spooled.write(BODY)
+    file = UploadFile(spooled, filename="resume.pdf", size=len(BODY))
+    temp_files = set(os.listdir(tempfile.gettempdir()))
+
+    upload = asyncio.run(spool_upload(file))
+
+    assert not upload.owns_path
+    assert set(os.listdir(tempfile.gettempdir())) == temp_files  # no copy was written
+    assert upload.digest == hashlib.sha256(BODY).hexdigest()
+    # Extraction workers are other processes: they must be able to open it too
+    read = subprocess.run([sys.executable, "-c", f"print(len(open({upload.source!r}, 'rb').read()))"],
+                          capture_output=True, text=True, check=True)
+    assert int(read.stdout) == len(BODY)
+    upload.close()
+    assert not spooled.closed  # FastAPI closes the form after the response
+    spooled.close()
+
+
+def test_upload_kept_in_memory_is_copied_and_removed_on_close():
+    file = UploadFile(io.BytesIO(BODY), filename="resume.pdf")
+    upload = asyncio.run(spool_upload(file, spool_bytes=1024))
+    assert upload.owns_path and os.path.exists(upload.path)
+    path = upload.path
+    upload.close()
+    assert not os.path.exists(path)
+
+
+def test_streamed_analysis_removes_the_upload_even_if_never_streamed(monkeypatch):
+    from routes import match
+
+    uploads = []
+    async def tracked_spool_upload(file):
+        uploads.append(await spool_upload(file, spool_bytes=1024))
+        return uploads[-1]
+    monkeypatch.setattr(match, "ensure_models_ready", lambda: None)
+    monkeypatch.setattr(match, "spool_upload", tracked_spool_upload)
+
+    async def respond_without_streaming():
+        file = UploadFile(io.BytesIO(BODY), filename="resume.pdf")
+        response = await match.upload_resume_stream(file=file, job_description="Python engineer " * 5)
+        path = uploads[0].path
+        assert os.path.exists(path)
+        await response.background()  # what Starlette runs after the response
+        return path
+
+    assert not os.path.exists(asyncio.run(respond_without_streaming()))
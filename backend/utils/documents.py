@@ -0,0 +1,61 @@
+import re
+from collections import namedtuple
+from dataclasses import dataclass
+
+# A sentence of the original text with its character offsets
+Sentence = namedtuple("Sentence", "text start end")
+
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+
+
+def preprocess_text(text):
+    """Enhanced text preprocessing for better semantic understanding"""
+    text = text.lower()
+    # Preserve important technical terms and compound words
+    text = re.sub(r'[^\w\s\-\+\#]', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def split_sentences(text):
+    """Sentences delimited by . ! ? runs, stripped, with offsets into `text`"""
+    sentences = []
+    for match in _SENTENCE_RE.finditer(text):
+        segment = match.group()
+        stripped = segment.strip()
+        if stripped:
+            start = match.start() + len(segment) - len(segment.lstrip())
+            sentences.append(Sentence(stripped, start, start + len(stripped)))
+    return tuple(sentences)
+
+
+@dataclass(frozen=True)
+class TextDocument:
+    """A text analysed once per request and shared by every scoring stage"""
+    raw: str
+    lower: str
+    normalized: str
+    tokens: frozenset
+    sentences: tuple
+
+    @classmethod
+    def from_text(cls, text):
+        normalized = preprocess_text(text)
+        return cls(
+            raw=text,
+            lower=text.lower(),
+            normalized=normalized,
+            tokens=frozenset(normalized.split()),
+            sentences=split_sentences(text),
+        )
+
+    def sentences_longer_than(self, min_length):
+        return [s.text for s in self.sentences if len(s.text) > min_length]
+
+
+class ResumeDocument(TextDocument):
+    """The candidate's resume"""
+
+
+class JobDocument(TextDocument):
+    """The job description"""
@@ -0,0 +1,224 @@
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from utils.warmup import warmup
+from utils.inference import inference_executor
+
+# Semantic model for deep text understanding
+SEMANTIC_MODEL_NAME = os.getenv("SEMANTIC_MODEL_NAME", "all-MiniLM-L6-v2")
+# How long the first sentence of a batch may wait for company, and how many
+# sentences close a batch early
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))
+# Sentence-embedding cache: memory budget in bytes, and whether vectors are
+# stored as float16 (half the memory, ~1e-3 precision)
+EMBEDDING_CACHE_BYTES = int(os.getenv("EMBEDDING_CACHE_BYTES", str(64 * 1024 * 1024)))
+EMBEDDING_CACHE_FLOAT16 = os.getenv("EMBEDDING_CACHE_FLOAT16", "0") == "1"
+
+
+def _load_semantic_model():
+    # Importing sentence_transformers pulls in torch, so it happens here too
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(SEMANTIC_MODEL_NAME)
+    model.encode(["warm-up"])
+    return model
+
+warmup.register("embedding", _load_semantic_model)
+
+def get_semantic_model():
+    return warmup.get("embedding")
+
+def encode_sentences(sentences):
+    """Unit-length float32 embeddings, so cosine similarity is a dot product.
+
+    Runs on the inference executor.
+    """
+    vectors = get_semantic_model().encode(sentences, normalize_embeddings=True, convert_to_numpy=True)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def unit_vector(vector):
+    """Rescale to unit length (e.g. a mean of unit vectors) so dot products stay cosines"""
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class EmbeddingBatcher:
+    """Coalesces encode requests from concurrent requests into shared model calls.
+
+    Sentences are collected for up to `max_wait_ms` after the first one arrives,
+    or until `max_batch_size` sentences are pending, then encoded in a single
+    call on the inference executor; each caller gets back its own rows.
+    """
+
+    def __init__(self, encode_fn=encode_sentences, max_wait_ms=EMBEDDING_BATCH_MAX_WAIT_MS,
+                 max_batch_size=EMBEDDING_BATCH_MAX_SIZE, executor=inference_executor):
+        self.encode_fn = encode_fn
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self._loop = None
+        self._pending = []
+        self._pending_sentences = 0
+        self._timer = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.sentences = 0
+
+    async def encode(self, sentences):
+        """Embeddings for `sentences`, one row per sentence"""
+        sentences = list(sentences)
+        if not sentences:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pending state belongs to the loop that created it
+            self._loop, self._pending, self._pending_sentences, self._timer = loop, [], 0, None
+
+        future = loop.create_future()
+        self._pending.append((sentences, future))
+        self._pending_sentences += len(sentences)
+        if self._pending_sentences >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_sentences = self._pending, [], 0
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        sentences = [sentence for items, _ in batch for sentence in items]
+        with self._lock:
+            self.batches += 1
+            self.requests += len(batch)
+            self.sentences += len(sentences)
+        try:
+            vectors = await self.executor.run(self.encode_fn, sentences)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for items, future in batch:
+            if not future.done():
+                future.set_result(vectors[offset:offset + len(items)])
+            offset += len(items)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_wait_ms": self.max_wait * 1000,
+                "max_batch_size": self.max_batch_size,
+                "batches": self.batches,
+                "requests": self.requests,
+                "sentences": self.sentences,
+                "avg_batch_sentences": round(self.sentences / self.batches, 1) if self.batches else 0.0,
+                "avg_batch_requests": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            }
+
+
+def normalize_sentence(sentence):
+    """Whitespace-insensitive form of a sentence, used as its cache identity"""
+    return " ".join(sentence.split())
+
+
+class EmbeddingCache:
+    """In-memory LRU of sentence embeddings keyed by sentence hash and model name, bounded in bytes"""
+
+    def __init__(self, max_bytes=EMBEDDING_CACHE_BYTES, float16=EMBEDDING_CACHE_FLOAT16, model_name=SEMANTIC_MODEL_NAME):
+        self.max_bytes = max_bytes
+        self.float16 = float16
+        self.model_name = model_name
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, sentence):
+        return hashlib.sha256(f"{self.model_name}\0{normalize_sentence(sentence)}".encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return vector.astype(np.float32)
+
+    def put(self, key, vector):
+        vector = np.array(vector, dtype=np.float16 if self.float16 else np.float32)
+        size = vector.nbytes + len(key)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes + len(key)
+            self._entries[key] = vector
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, old_vector = self._entries.popitem(last=False)
+                self._bytes -= old_vector.nbytes + len(old_key)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "model": self.model_name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "items": len(self._entries),
+                "bytes": self._bytes,
+                "budget_bytes": self.max_bytes,
+                "float16": self.float16,
+                "evictions": self.evictions,
+            }
+
+
+# Shared batcher in front of the sentence-transformer model
+embedding_batcher = EmbeddingBatcher()
+# Shared cache of already-encoded sentences
+embedding_cache = EmbeddingCache()
+
+
+async def embed_sentences(sentences):
+    """Unit-length float32 embeddings for `sentences`, one row each.
+
+    Only unseen sentences reach the model, each distinct one once, in a single
+    batch sorted by length so padding is minimal.
+    """
+    keys = [embedding_cache.make_key(sentence) for sentence in sentences]
+    vectors = [embedding_cache.get(key) for key in keys]
+
+    missing = {}
+    for sentence, key, vector in zip(sentences, keys, vectors):
+        if vector is None and key not in missing:
+            missing[key] = normalize_sentence(sentence)
+    if missing:
+        ordered = sorted(missing, key=lambda key: len(missing[key]))
+        encoded = await embedding_batcher.encode([missing[key] for key in ordered])
+        fresh = dict(zip(ordered, encoded))
+        for key, vector in fresh.items():
+            embedding_cache.put(key, vector)
+        vectors = [fresh[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+
+    return np.vstack([np.asarray(vector, dtype=np.float32) for vector in vectors])
@@ -0,0 +1,189 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# Worker processes for document parsing; 0 parses in-process (no isolation)
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+# Wall-clock budget for one document, across all of its parse tasks
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "20"))
+# Address-space cap per worker (POSIX only); 0 disables the limit
+EXTRACTION_MEMORY_LIMIT_MB = int(os.getenv("EXTRACTION_MEMORY_LIMIT_MB", "1024"))
+# Workers are replaced after this many tasks to shed leaked memory/state
+EXTRACTION_MAX_TASKS_PER_CHILD = int(os.getenv("EXTRACTION_MAX_TASKS_PER_CHILD", "100"))
+
+
+class ExtractionTimeout(Exception):
+    """A parse task did not finish before the document's deadline"""
+
+
+class ExtractionCrashed(Exception):
+    """A worker died while parsing (e.g. hit its memory limit or segfaulted).
+
+    `collateral` is True when the task was lost because the pool had already
+    been torn down on behalf of another task.
+    """
+
+    def __init__(self, message, collateral=False):
+        super().__init__(message)
+        self.collateral = collateral
+
+
+def _init_worker(memory_limit_mb):
+    """Pool initializer: cap the worker's memory so a runaway parse fails instead of swapping"""
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        print(f"Could not apply extraction worker memory limit: {e}")
+
+
+def _succeeded(future):
+    return future.done() and not future.cancelled() and future.exception() is None
+
+
+class ExtractionSupervisor:
+    """Process pool for document parsing that kills and replaces workers that overrun.
+
+    Tasks are waited on against a per-document deadline. When one overruns, the
+    whole pool is torn down (its processes are killed, since a stuck parser
+    cannot be interrupted) and a fresh pool is created for the next task.
+    Tasks of other documents that were lost with the old pool are resubmitted
+    once.
+    """
+
+    def __init__(self, workers=EXTRACTION_WORKERS, memory_limit_mb=EXTRACTION_MEMORY_LIMIT_MB,
+                 max_tasks_per_child=EXTRACTION_MAX_TASKS_PER_CHILD):
+        self.workers = workers
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self._pool = None
+        self._lock = threading.Lock()
+        self.tasks = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycles = 0
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # max_tasks_per_child requires a spawn-based context
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.memory_limit_mb,),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+            return self._pool
+
+    def recycle(self, pool):
+        """Kill every worker of `pool` and start over with a fresh pool.
+
+        Returns False when the pool had already been replaced by another caller.
+        """
+        with self._lock:
+            if self._pool is not pool:
+                return False
+            self._pool = None
+            self.recycles += 1
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            try:
+                process.kill()
+            except Exception:
+                pass
+        pool.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    def submit(self, fn, *args):
+        """Queue a task; returns a handle for result()"""
+        with self._lock:
+            self.tasks += 1
+        pool = self._get_pool()
+        try:
+            return pool, pool.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            # Pool broke or was shut down between lookup and submit
+            self.recycle(pool)
+            pool = self._get_pool()
+            return pool, pool.submit(fn, *args)
+
+    def result(self, task, deadline=None):
+        """Wait for a submitted task until `deadline` (time.monotonic() value)"""
+        pool, future = task
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            self.recycle(pool)
+            raise ExtractionTimeout("Document parsing exceeded its time limit")
+        except (BrokenProcessPool, CancelledError):
+            recycled_here = self.recycle(pool)
+            if recycled_here:
+                with self._lock:
+                    self.crashes += 1
+            raise ExtractionCrashed("Document parser process died", collateral=not recycled_here)
+
+    def call(self, fn, *args, deadline=None):
+        """Run fn(*args) in a worker, resubmitting once if the pool was recycled under it"""
+        results = self.map(fn, [args], deadline)
+        try:
+            return next(results)
+        finally:
+            results.close()
+
+    def map(self, fn, arg_tuples, deadline=None):
+        """Run fn(*args) for every tuple concurrently and yield the results in order.
+
+        If the pool is recycled under the tasks (another document's timeout
+        or crash killed it), every task lost with it is resubmitted to the new
+        pool, once. Closing the generator cancels tasks that have not started.
+        """
+        arg_tuples = list(arg_tuples)
+        tasks = [self.submit(fn, *args) for args in arg_tuples]
+        resubmitted = False
+        try:
+            for index, args in enumerate(arg_tuples):
+                try:
+                    yield self.result(tasks[index], deadline)
+                    continue
+                except ExtractionCrashed as e:
+                    if not e.collateral or resubmitted:
+                        raise
+                resubmitted = True
+                lost_pool = tasks[index][0]
+                for later in range(index, len(tasks)):
+                    if tasks[later][0] is lost_pool and not _succeeded(tasks[later][1]):
+                        tasks[later] = self.submit(fn, *arg_tuples[later])
+                yield self.result(tasks[index], deadline)
+        finally:
+            for _, future in tasks:
+                future.cancel()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "tasks": self.tasks,
+                "timeouts": self.timeouts,
+                "crashes": self.crashes,
+                "recycles": self.recycles,
+            }
+
+
+# Shared pool used by the resume parser
+extraction_supervisor = ExtractionSupervisor()
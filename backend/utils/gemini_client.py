@@ -1,21 +1,35 @@
+import asyncio
+import json
 import os
+import aiohttp
 from dotenv import load_dotenv
-import google.generativeai as genai
+from utils.singleflight import llm_calls
 
 # Load your API key
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 # Use correct model path
-model = genai.GenerativeModel("models/gemini-1.5-flash")
-
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "models/gemini-1.5-flash")
+# REST endpoint used by the async client (a local stub in the benchmarks)
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+# Per-call deadline, and how many connections the shared session keeps open
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "30"))
+GEMINI_MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", "32"))
 
+_sync_model = None
 
 
 def get_gemini_response(prompt: str) -> str:
+    """Blocking SDK call, for scripts; the server uses get_gemini_response_async"""
+    global _sync_model
     try:
+        if _sync_model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=GEMINI_API_KEY)
+            _sync_model = genai.GenerativeModel(GEMINI_MODEL)
         print("=== SENDING PROMPT TO GEMINI ===")
-        response = model.generate_content(prompt)
+        response = _sync_model.generate_content(prompt)
         content = response.text.strip()
         print(f"✅ GEMINI RESPONSE RECEIVED — Length: {len(content)}")
         return content
@@ -23,3 +37,141 @@ def get_gemini_response(prompt: str) -> str:
         print(f"❌ Gemini API error: {e}")
         raise Exception("Gemini request failed")
 
+
+class GeminiError(Exception):
+    """Gemini answered with an error status or without any text"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class AsyncGeminiClient:
+    """generateContent over one pooled aiohttp session.
+
+    The session (and its keep-alive connections) is created on first use and
+    shared by every request on the event loop. Each call has its own timeout,
+    and cancelling the awaiting task aborts the HTTP request.
+    """
+
+    def __init__(self, api_key=GEMINI_API_KEY, model=GEMINI_MODEL, base_url=GEMINI_API_BASE,
+                 timeout=GEMINI_TIMEOUT_SECONDS, max_connections=GEMINI_MAX_CONNECTIONS):
+        self.api_key = api_key
+        self.model = model if model.startswith("models/") else f"models/{model}"
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._session = None
+        self._loop = None
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # A session belongs to the loop that created it
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+        return self._session
+
+    async def generate(self, prompt, timeout=None):
+        """Text of the first candidate for `prompt`"""
+        url = f"{self.base_url}/{self.model}:generateContent"
+        headers = {"x-goog-api-key": self.api_key or ""}
+        body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        deadline = aiohttp.ClientTimeout(total=timeout or self.timeout)
+
+        async with self._get_session().post(url, json=body, headers=headers, timeout=deadline) as response:
+            try:
+                payload = await response.json(content_type=None) or {}
+            except ValueError:
+                payload = {}
+            if response.status != 200:
+                message = payload.get("error", {}).get("message", response.reason)
+                raise GeminiError(f"Gemini returned {response.status}: {message}", status=response.status)
+
+        parts = ((payload.get("candidates") or [{}])[0].get("content") or {}).get("parts") or []
+        text = "".join(part.get("text", "") for part in parts).strip()
+        if not text:
+            raise GeminiError("Gemini returned no text", status=response.status)
+        return text
+
+    async def stream(self, prompt, timeout=None):
+        """Yield the first candidate's text piece by piece as Gemini generates it.
+
+        Uses streamGenerateContent with server-sent events; `timeout` bounds
+        the wait for each piece rather than the whole answer.
+        """
+        url = f"{self.base_url}/{self.model}:streamGenerateContent"
+        headers = {"x-goog-api-key": self.api_key or ""}
+        body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        deadline = aiohttp.ClientTimeout(total=None, sock_connect=timeout or self.timeout, sock_read=timeout or self.timeout)
+
+        async with self._get_session().post(url, params={"alt": "sse"}, json=body, headers=headers, timeout=deadline) as response:
+            if response.status != 200:
+                try:
+                    payload = await response.json(content_type=None) or {}
+                except ValueError:
+                    payload = {}
+                if isinstance(payload, list):
+                    payload = payload[0] if payload else {}
+                message = payload.get("error", {}).get("message", response.reason)
+                raise GeminiError(f"Gemini returned {response.status}: {message}", status=response.status)
+
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                chunk = json.loads(line[5:])
+                parts = ((chunk.get("candidates") or [{}])[0].get("content") or {}).get("parts") or []
+                text = "".join(part.get("text", "") for part in parts)
+                if text:
+                    yield text
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# Shared client, so all requests reuse the same connections
+gemini_client = AsyncGeminiClient()
+
+
+async def get_gemini_response_async(prompt: str, timeout=None) -> str:
+    """Gemini's answer to `prompt`; identical prompts already in flight share one call"""
+    return await llm_calls.run(("gemini", gemini_client.model, prompt), _request_gemini_response, prompt, timeout)
+
+
+async def _request_gemini_response(prompt, timeout):
+    try:
+        print("=== SENDING PROMPT TO GEMINI ===")
+        content = await gemini_client.generate(prompt, timeout=timeout)
+        print(f"✅ GEMINI RESPONSE RECEIVED — Length: {len(content)}")
+        return content
+    except asyncio.CancelledError:
+        raise
+    except asyncio.TimeoutError:
+        print(f"❌ Gemini API timed out after {timeout or gemini_client.timeout}s")
+        raise Exception("Gemini request failed")
+    except Exception as e:
+        print(f"❌ Gemini API error: {e}")
+        raise Exception("Gemini request failed")
+
+
+async def stream_gemini_response(prompt: str, timeout=None):
+    """Gemini's answer to `prompt` as it is generated; streams are not coalesced"""
+    print("=== STREAMING PROMPT TO GEMINI ===")
+    length = 0
+    try:
+        async for text in gemini_client.stream(prompt, timeout=timeout):
+            length += len(text)
+            yield text
+    except asyncio.CancelledError:
+        raise
+    except asyncio.TimeoutError:
+        print(f"❌ Gemini stream stalled for {timeout or gemini_client.timeout}s")
+        raise Exception("Gemini request failed")
+    except Exception as e:
+        print(f"❌ Gemini API error: {e}")
+        raise Exception("Gemini request failed")
+    print(f"✅ GEMINI STREAM COMPLETED — Length: {length}")
@@ -0,0 +1,121 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# "thread" shares one model across threads (torch releases the GIL while
+# encoding); "process" gives every worker its own model copy
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+# Jobs allowed to wait for a worker before new ones are refused
+INFERENCE_MAX_QUEUE = int(os.getenv("INFERENCE_MAX_QUEUE", "32"))
+
+
+class InferenceOverloaded(Exception):
+    """The inference queue is full; the caller should retry later"""
+
+
+def _init_process_worker():
+    """Process-pool initializer: load this worker's own copy of the models"""
+    from utils.embeddings import get_semantic_model
+    get_semantic_model()
+
+
+def _timed_call(fn, args):
+    # Runs on the worker; returns wall-clock start time so queue wait can be
+    # measured for process workers too
+    started = time.time()
+    return started, fn(*args)
+
+
+def latency_summary(samples):
+    """Mean/p50/p95/max in milliseconds of durations given in seconds"""
+    if not samples:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "mean_ms": round(1000 * sum(ordered) / len(ordered), 2),
+        "p50_ms": round(1000 * pick(0.50), 2),
+        "p95_ms": round(1000 * pick(0.95), 2),
+        "max_ms": round(1000 * ordered[-1], 2),
+    }
+
+
+class InferenceExecutor:
+    """Bounded executor for CPU-bound scoring work, with queue depth and wait-time metrics"""
+
+    def __init__(self, kind=INFERENCE_EXECUTOR, workers=INFERENCE_WORKERS, max_queue=INFERENCE_MAX_QUEUE):
+        self.kind = kind
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._wait_times = deque(maxlen=1024)
+        self._run_times = deque(maxlen=1024)
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_process_worker,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+            return self._executor
+
+    @property
+    def queue_depth(self):
+        """Jobs submitted but not yet picked up by a worker"""
+        return max(0, self._in_flight - self.workers)
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the executor without blocking the event loop"""
+        with self._lock:
+            if self.queue_depth >= self.max_queue:
+                self.rejected += 1
+                raise InferenceOverloaded("Inference queue is full")
+            self._in_flight += 1
+
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            started, result = await loop.run_in_executor(self._get_executor(), _timed_call, fn, args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        finished = time.time()
+        with self._lock:
+            self.completed += 1
+            self._wait_times.append(max(0.0, started - submitted))
+            self._run_times.append(finished - started)
+        return result
+
+    def stats(self):
+        with self._lock:
+            wait_times, run_times = list(self._wait_times), list(self._run_times)
+            return {
+                "executor": self.kind,
+                "workers": self.workers,
+                "in_flight": self._in_flight,
+                "queue_depth": self.queue_depth,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_time": latency_summary(wait_times),
+                "run_time": latency_summary(run_times),
+            }
+
+
+# Shared executor for embedding, TF-IDF and regex scoring stages
+inference_executor = InferenceExecutor()
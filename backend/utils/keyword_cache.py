@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# In-process tier: number of job descriptions whose keywords stay in memory
+KEYWORD_CACHE_MEMORY_ITEMS = int(os.getenv("KEYWORD_CACHE_MEMORY_ITEMS", "512"))
+# Persistent tier: SQLite file shared by all workers, and how long an entry lives
+KEYWORD_CACHE_PATH = os.getenv(
+    "KEYWORD_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "job_keywords.sqlite3"),
+)
+KEYWORD_CACHE_TTL_SECONDS = float(os.getenv("KEYWORD_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+def normalize_job_description(job_description):
+    """Whitespace-insensitive form of a job description, used as its cache identity"""
+    return " ".join(job_description.split())
+
+
+class KeywordCache:
+    """Two-tier (memory LRU + SQLite) cache of LLM-extracted job keywords, with a TTL.
+
+    Entries are keyed by the normalized job description together with the
+    prompt version and model that produced them, so changing either simply
+    stops old entries from matching. SQLite errors are reported and treated
+    as misses; the memory tier keeps working.
+    """
+
+    def __init__(self, path=KEYWORD_CACHE_PATH, max_items=KEYWORD_CACHE_MEMORY_ITEMS, ttl=KEYWORD_CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_items = max_items
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        # The memory tier's lock is never held across SQLite calls, so lookups
+        # on the event loop cannot wait behind a slow or contended write
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def make_key(job_description, prompt_version, model):
+        normalized = normalize_job_description(job_description)
+        return hashlib.sha256(f"{model}\0{prompt_version}\0{normalized}".encode()).hexdigest()
+
+    def _connect(self):
+        """Open (and create) the database on first use; called with the database lock held"""
+        if self._db is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            # WAL lets several server processes read while one writes
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS job_keywords ("
+                "key TEXT PRIMARY KEY, keywords TEXT NOT NULL, created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            db.execute("DELETE FROM job_keywords WHERE expires_at <= ?", (time.time(),))
+            db.commit()
+            self._db = db
+        return self._db
+
+    def get(self, key):
+        """Keywords cached for `key` in either tier, or None (blocks on SQLite; see get_async)"""
+        keywords = self.get_memory(key)
+        return keywords if keywords is not None else self._get_disk(key)
+
+    async def get_async(self, key):
+        """get() for the event loop: only the SQLite lookup runs on a worker thread"""
+        keywords = self.get_memory(key)
+        if keywords is not None:
+            return keywords
+        return await asyncio.get_running_loop().run_in_executor(None, self._get_disk, key)
+
+    def get_memory(self, key):
+        """Keywords from the memory tier only, or None; never touches SQLite"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, keywords = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return list(keywords)
+            del self._memory[key]
+            self.expired += 1
+            return None
+
+    def _get_disk(self, key):
+        now = time.time()
+        try:
+            with self._db_lock:
+                row = self._connect().execute(
+                    "SELECT keywords, expires_at FROM job_keywords WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Keyword cache read failed: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            keywords = json.loads(row[0])
+            self.disk_hits += 1
+            self._remember(key, row[1], keywords)
+            return list(keywords)
+
+    def put(self, key, keywords):
+        """Store `keywords` in both tiers (blocks on SQLite; see put_nowait)"""
+        self._put_disk(key, *self._put_memory(key, keywords))
+
+    def put_nowait(self, key, keywords):
+        """put() from the event loop: memory now, the SQLite write on a worker thread.
+
+        Returns the future of the write.
+        """
+        return asyncio.get_running_loop().run_in_executor(None, self._put_disk, key, *self._put_memory(key, keywords))
+
+    def _put_memory(self, key, keywords):
+        now = time.time()
+        keywords = list(keywords)
+        with self._lock:
+            self._remember(key, now + self.ttl, keywords)
+        return keywords, now
+
+    def _put_disk(self, key, keywords, now):
+        try:
+            with self._db_lock:
+                db = self._connect()
+                db.execute(
+                    "INSERT OR REPLACE INTO job_keywords (key, keywords, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(keywords), now, now + self.ttl)
+                )
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"Keyword cache write failed: {e}")
+
+    def _remember(self, key, expires_at, keywords):
+        self._memory[key] = (expires_at, tuple(keywords))
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "ttl_seconds": self.ttl,
+            }
+
+
+# Shared instance used by keyword extraction
+job_keyword_cache = KeywordCache()
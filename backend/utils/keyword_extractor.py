@@ -0,0 +1,231 @@
+"""Local keyword and phrase extraction for job descriptions.
+
+Combines three signals, all computed in-process in a few milliseconds:
+
+* a skills gazetteer (data/skills.txt) matched with the keyword automaton,
+* RAKE-style candidate phrases (runs of content words between stopwords and
+  punctuation) scored by word degree / frequency,
+* YAKE-style features: casing (acronyms and brand names), position of first
+  occurrence, phrase frequency and whether the phrase sits in a
+  requirements clause.
+
+Gazetteer skills come first, then the best statistical phrases.
+"""
+import math
+import os
+import re
+from collections import Counter, namedtuple
+from functools import lru_cache
+from utils.documents import preprocess_text
+from utils.keyword_matcher import compile_keywords
+
+SKILLS_GAZETTEER_PATH = os.getenv(
+    "SKILLS_GAZETTEER_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "skills.txt"),
+)
+MAX_KEYWORDS = 20
+# Share of the keyword slots gazetteer skills may take, so that
+# posting-specific phrases still make the list
+MAX_GAZETTEER_SHARE = 0.75
+MAX_PHRASE_WORDS = 4
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each either etc few for from further had has have having he
+her here hers herself him himself his how i if in into is it its itself just may me might more most must my
+myself no nor not of off on once only or other our ours ourselves out over own per same shall she should so
+some such than that the their theirs them themselves then there these they this those through to too under
+until up upon us very via was we were what when where which while who whom why will with within without would
+you your yours yourself yourselves
+""".split())
+
+# Words that are everywhere in job ads and never a keyword on their own
+GENERIC_WORDS = frozenset("""
+ability able across actively additional apply applicant applicants area areas benefits best build building
+candidate candidates company competitive content culture day daily deliver demonstrated desired develop
+develops drive ensure environment equal excellent existing experience experienced familiarity fast
+following full good great help highly ideal ideally including join key knowledge level looking make new
+nice offer opportunity orientated oriented paced part passion passionate plus position preferred proven
+provide qualifications related relevant required requirement requirements responsibilities responsible
+role salary seeking self skill skills solid strong success successful support team teams time tools
+understanding using various well work working world year years
+always c-suite client clients customer customers extra fail fails go group hire hiring languages mile plan
+present rely result results we're we'll you'll you're
+""".split())
+
+REQUIREMENT_CUES = re.compile(r"\b(?:required?|must|minimum|proficien\w*|experience (?:with|in)|knowledge of|expert\w*)\b", re.I)
+CLAUSE_SPLIT = re.compile(r"[,;:!?()\[\]{}\n\r\t•·|\"]+|\.(?=\s|$)")
+WORD = re.compile(r"[A-Za-z0-9][\w+#./&'-]*[\w+#]|[A-Za-z0-9]")
+# Context that makes an ambiguous language name ('!' entries) a skill: a cue
+# word just before it ("in R", "Languages: C") or just after it ("C programming")
+LANGUAGE_CUE_BEFORE = re.compile(r"\b(?:in|with|using|programming|languages?|like)\s*:?\s*$", re.I)
+LANGUAGE_CUE_AFTER = re.compile(r"^\s*(?:programming|language|developer|development|code|coding)\b", re.I)
+# A list neighbour ("Python, R", "C/C++", "Java or Go") that is itself a known skill
+LIST_NEIGHBOUR_BEFORE = re.compile(r"([\w+#.]+)\s*(?:,|/|\band\b|\bor\b)\s*$", re.I)
+LIST_NEIGHBOUR_AFTER = re.compile(r"^\s*(?:,|/|\band\b|\bor\b)\s*([\w+#.]*[\w+#])", re.I)
+EXPERIENCE_YEARS = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:-\s*\d{1,2}\s*)?years?\b(?:\s+of)?(?:\s+\w+)?\s+experience", re.I)
+
+
+Gazetteer = namedtuple("Gazetteer", "matcher sensitive names")
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer(path=SKILLS_GAZETTEER_PATH):
+    """Gazetteer(matcher, sensitive, names) for the skills gazetteer.
+
+    `matcher` finds the case-insensitive entries. `sensitive` holds
+    (term, pattern, needs_context) for entries prefixed with '=' (common
+    words such as Swift or Spring, which only count with exactly that
+    casing) and '!' (language names such as C, R or Go, which additionally
+    need a language context). `names` is every entry, lowercased.
+    """
+    insensitive, sensitive = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = line.strip()
+            if not entry or entry.startswith("#"):
+                continue
+            if entry[0] in "=!":
+                term = entry[1:]
+                # "R&D", "C-suite" and "A/B" are not the languages
+                pattern = re.compile(r"(?<![\w&/-])" + re.escape(term) + r"(?![\w+#&-])")
+                sensitive.append((term, pattern, entry[0] == "!"))
+            else:
+                insensitive.append(entry)
+    names = frozenset(entry.lower() for entry in insensitive) | frozenset(term.lower() for term, _, _ in sensitive)
+    return Gazetteer(compile_keywords(tuple(insensitive)), tuple(sensitive), names)
+
+
+def in_language_context(text, start, end, names):
+    """Whether the term at text[start:end] is used as a programming language"""
+    before, after = text[max(0, start - 40):start], text[end:end + 40]
+    if after.startswith("/"):
+        # "C/C++" counts, "A/B" or "and/or" does not
+        neighbour = LIST_NEIGHBOUR_AFTER.match(after)
+        return bool(neighbour) and neighbour.group(1).lower() in names
+    if LANGUAGE_CUE_BEFORE.search(before) or LANGUAGE_CUE_AFTER.match(after):
+        return True
+    for pattern, context in ((LIST_NEIGHBOUR_BEFORE, before), (LIST_NEIGHBOUR_AFTER, after)):
+        neighbour = pattern.search(context)
+        if neighbour and neighbour.group(1).lower() in names:
+            return True
+    return False
+
+
+def gazetteer_skills(text, normalized):
+    """Gazetteer skills present in the text, with first offset and count"""
+    gazetteer = load_gazetteer()
+    found = {}
+    for skill, spans in gazetteer.matcher.match(normalized).offsets.items():
+        found[skill.lower()] = (spans[0][0] / max(len(normalized), 1), len(spans))
+    for skill, pattern, needs_context in gazetteer.sensitive:
+        hits = [m.start() for m in pattern.finditer(text)
+                if not needs_context or in_language_context(text, m.start(), m.end(), gazetteer.names)]
+        if hits:
+            found[skill.lower()] = (hits[0] / max(len(text), 1), len(hits))
+    return found
+
+
+def _is_content_word(word):
+    # Single letters ("Plan C", "A/B") are left to the gazetteer
+    lower = word.lower()
+    return len(lower) > 1 and lower not in STOPWORDS and lower not in GENERIC_WORDS and not lower.isdigit()
+
+
+def candidate_phrases(text):
+    """RAKE candidates: maximal runs of content words inside a clause.
+
+    Returns (words, clause_index, starts_clause, in_requirement_clause) tuples
+    in text order; `words` are the phrase's words as written.
+    """
+    candidates = []
+    for clause_index, clause in enumerate(CLAUSE_SPLIT.split(text)):
+        requirement = bool(REQUIREMENT_CUES.search(clause))
+        words = WORD.findall(clause)
+        run_start = 0
+        run = []
+        for index, word in enumerate(words + [""]):
+            if word and _is_content_word(word):
+                if not run:
+                    run_start = index
+                run.append(word)
+                continue
+            if 0 < len(run) <= MAX_PHRASE_WORDS:
+                candidates.append((tuple(run), clause_index, run_start == 0, requirement))
+            run = []
+    return candidates
+
+
+def _casing(words, starts_clause):
+    """1.0 for acronyms / mid-sentence capitals (brands, products), else 0"""
+    if any(len(word) > 1 and word.isupper() for word in words):
+        return 1.0
+    if not starts_clause and words[0][:1].isupper():
+        return 1.0
+    return 0.0
+
+
+def score_phrases(text):
+    """Statistical score for each candidate phrase (lowercased), highest first"""
+    candidates = candidate_phrases(text)
+    if not candidates:
+        return []
+    clause_count = candidates[-1][1] + 1
+
+    frequency = Counter()
+    degree = Counter()
+    for words, _, _, _ in candidates:
+        for word in words:
+            frequency[word.lower()] += 1
+            degree[word.lower()] += len(words)
+
+    phrases = {}
+    for words, clause, starts_clause, requirement in candidates:
+        key = " ".join(words).lower()
+        stats = phrases.setdefault(key, {"count": 0, "first": clause, "casing": 0.0, "requirement": False,
+                                         "words": [word.lower() for word in words]})
+        stats["count"] += 1
+        stats["casing"] = max(stats["casing"], _casing(words, starts_clause))
+        stats["requirement"] = stats["requirement"] or requirement
+
+    scored = []
+    for key, stats in phrases.items():
+        if len(key) < 2:
+            continue
+        rake = sum(degree[word] / frequency[word] for word in stats["words"])
+        position = 1.0 / math.log2(2 + 8 * stats["first"] / clause_count)
+        score = rake * (1 + stats["casing"]) * (1 + math.log1p(stats["count"])) * position
+        if stats["requirement"]:
+            score *= 1.25
+        scored.append((score, key))
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return scored
+
+
+def extract_local_keywords(job_description, limit=MAX_KEYWORDS):
+    """Up to `limit` lowercase keywords for a job description, without any model call"""
+    normalized = preprocess_text(job_description)
+    keywords = []
+
+    # Gazetteer skills, most mentioned first, then earliest
+    skills = gazetteer_skills(job_description, normalized)
+    ranked_skills = sorted(skills, key=lambda skill: (-skills[skill][1], skills[skill][0]))
+    keywords.extend(ranked_skills[:max(1, int(limit * MAX_GAZETTEER_SHARE))])
+
+    # Experience level ("5+ years experience")
+    years = EXPERIENCE_YEARS.search(job_description)
+    if years:
+        keywords.append(f"{years.group(1)}+ years experience")
+
+    # Statistical phrases that are not just a piece of a keyword already taken
+    taken = [f" {preprocess_text(keyword)} " for keyword in keywords]
+    for _, phrase in score_phrases(job_description):
+        if len(keywords) >= limit:
+            break
+        normalized_phrase = f" {preprocess_text(phrase)} "
+        if any(normalized_phrase in keyword for keyword in taken):
+            continue
+        keywords.append(phrase)
+        taken.append(normalized_phrase)
+
+    return keywords[:limit]
@@ -0,0 +1,223 @@
+"""Match job keywords against a resume, each spelling variant on word boundaries.
+
+A hit only counts when it starts and ends on a word boundary, so "java"
+does not match inside "javascript"; a simple plural suffix ("APIs" for
+"api") is allowed before the closing boundary. Short keyword lists (the
+usual ~20 LLM keywords) are found with one C-level str.find scan per
+variant; longer lists are compiled into one Aho–Corasick automaton that
+walks the normalized resume text once, which only wins once the number of
+variants outweighs its per-character Python loop
+(see benchmarks/keyword_matching.py).
+"""
+import os
+import re
+from collections import deque, namedtuple
+from functools import lru_cache
+from utils.documents import preprocess_text
+
+# Keyword lists up to this size are matched with str.find instead of the automaton
+KEYWORD_SCAN_MAX_KEYWORDS = int(os.getenv("KEYWORD_SCAN_MAX_KEYWORDS", "300"))
+# Suffixes a resume may add to a keyword and still match it ("apis", "databases")
+PLURAL_SUFFIXES = ("", "s", "es")
+# Normalized text only keeps word characters, spaces and - + #
+_WORD_SEPARATORS = re.compile(r"[^\w]+")
+
+# matched/missing keep the input order; offsets maps each matched keyword to
+# its (start, end) spans in the normalized resume text
+KeywordMatches = namedtuple("KeywordMatches", "matched missing offsets")
+
+
+class AhoCorasick:
+    """Aho–Corasick automaton over a fixed list of patterns"""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                node = child
+            self._output[node] += (pattern_id,)
+
+        # Breadth-first: a node's failure link points at the longest proper
+        # suffix of its path that is also a path from the root
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] += self._output[self._fail[child]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, pattern_id) for every occurrence, overlapping ones included"""
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self.patterns
+        node = 0
+        for index, char in enumerate(text):
+            child = goto[node].get(char)
+            while child is None and node:
+                node = fail[node]
+                child = goto[node].get(char)
+            node = child or 0
+            if output[node]:
+                for pattern_id in output[node]:
+                    yield index - len(patterns[pattern_id]) + 1, index + 1, pattern_id
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def _hit_end(text, start, end):
+    """End of the hit text[start:end] including an allowed plural suffix, or None if it is not on word boundaries"""
+    if start > 0 and _is_word_char(text[start - 1]):
+        return None
+    for suffix in PLURAL_SUFFIXES:
+        stop = end + len(suffix)
+        if text.startswith(suffix, end) and (stop >= len(text) or not _is_word_char(text[stop])):
+            return stop
+    return None
+
+
+@lru_cache(maxsize=256)
+def _word_set(tokens):
+    """Every maximal run of word characters among whitespace tokens ("ci-cd" gives "ci-cd", "ci", "cd")"""
+    words = set(tokens)
+    for token in tokens:
+        if not token.isalnum():
+            words.update(part for part in _WORD_SEPARATORS.split(token) if part)
+    return words
+
+
+def _may_occur(prefilter, words):
+    leading, last_forms = prefilter
+    return leading <= words and not last_forms.isdisjoint(words)
+
+
+def _prefilter(variant):
+    """(leading words, spellings of the last word) a text must contain for the variant to occur on word boundaries"""
+    parts = [part for part in _WORD_SEPARATORS.split(variant) if part]
+    if not parts:
+        return None
+    *leading, last = parts
+    return frozenset(leading), frozenset(last + suffix for suffix in PLURAL_SUFFIXES)
+
+
+def keyword_variants(keyword):
+    """Spellings a keyword may take in a resume, normalized like the resume text"""
+    keyword = keyword.strip().lower()
+    variants = {
+        keyword,
+        keyword.replace(" ", ""),
+        keyword.replace(" ", "-"),
+        keyword.replace("-", " "),
+        keyword.replace("_", " "),
+        keyword.replace(".", ""),
+        keyword.replace("+", "plus"),
+        keyword.replace("#", "sharp"),
+        keyword.replace("&", "and"),
+    }
+    return {normalized for normalized in map(preprocess_text, variants) if normalized}
+
+
+class KeywordMatcher:
+    """All variants of a keyword list, matched by str.find scans or one automaton depending on list size"""
+
+    def __init__(self, keywords, scan_max_keywords=KEYWORD_SCAN_MAX_KEYWORDS):
+        self.keywords = [keyword.strip() for keyword in keywords]
+        owners = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            for variant in keyword_variants(keyword):
+                owners.setdefault(variant, []).append(keyword_id)
+        self._variants = list(owners)
+        self._prefilters = [_prefilter(variant) for variant in owners]
+        self._owners = list(owners.values())
+        self._automaton = AhoCorasick(owners) if len(self.keywords) > scan_max_keywords else None
+
+    def _scan(self, text, tokens, all_spans, offsets):
+        """Fill `offsets` with str.find scans, one per variant that can occur at all"""
+        if tokens is None:
+            tokens = frozenset(text.split())
+        words = padded = None
+        for variant_id, variant in enumerate(self._variants):
+            owners = self._owners[variant_id]
+            if not all_spans:
+                if all(keyword_id in offsets for keyword_id in owners):
+                    continue
+                if variant in tokens:
+                    # A whole whitespace token sits between spaces in the
+                    # single-spaced normalized text, so its first hit needs
+                    # no boundary checks
+                    if padded is None:
+                        padded = f" {text} "
+                    start = padded.find(f" {variant} ")
+                    for keyword_id in owners:
+                        offsets.setdefault(keyword_id, []).append((start, start + len(variant)))
+                    continue
+            # Set lookups rule out most variants before any scan of the text;
+            # words inside tokens ("ci" in "ci-cd") are only split out when
+            # the whole tokens do not already allow the variant
+            prefilter = self._prefilters[variant_id]
+            if prefilter is not None and not _may_occur(prefilter, tokens):
+                if words is None:
+                    words = _word_set(tokens)
+                if not _may_occur(prefilter, words):
+                    continue
+            start = text.find(variant)
+            while start != -1:
+                end = _hit_end(text, start, start + len(variant))
+                if end is not None:
+                    for keyword_id in owners:
+                        offsets.setdefault(keyword_id, []).append((start, end))
+                    if not all_spans:
+                        break
+                start = text.find(variant, start + 1)
+
+    def match(self, text, tokens=None, all_spans=True):
+        """KeywordMatches for a normalized text (see utils.documents.preprocess_text).
+
+        `tokens` is the text's frozenset of whitespace tokens, when the caller
+        already has it (ResumeDocument.tokens). With `all_spans=False`
+        `offsets` holds one span per matched keyword, whichever hit each
+        strategy finds first, and short lists stop scanning a keyword there.
+        """
+        offsets = {}
+        if self._automaton is None:
+            self._scan(text, tokens, all_spans, offsets)
+        else:
+            for start, end, variant_id in self._automaton.iter_matches(text):
+                end = _hit_end(text, start, end)
+                if end is None:
+                    continue
+                for keyword_id in self._owners[variant_id]:
+                    spans = offsets.setdefault(keyword_id, [])
+                    if all_spans or not spans:
+                        spans.append((start, end))
+
+        matched = [keyword for i, keyword in enumerate(self.keywords) if i in offsets]
+        missing = [keyword for i, keyword in enumerate(self.keywords) if i not in offsets]
+        return KeywordMatches(matched, missing, {self.keywords[i]: spans for i, spans in offsets.items()})
+
+
+@lru_cache(maxsize=128)
+def compile_keywords(keywords):
+    """Cached KeywordMatcher for a tuple of keywords (e.g. one job's keywords across many resumes)"""
+    return KeywordMatcher(keywords)
+
+
+def match_keywords(normalized_text, keywords, tokens=None, all_spans=True):
+    return compile_keywords(tuple(keywords)).match(normalized_text, tokens, all_spans)
@@ -1,33 +1,49 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-import string
+import os
 import re
+import asyncio
+from collections import namedtuple
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from utils.gemini_client import get_gemini_response
-
-
-# Initialize semantic model for deep text understanding
-semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
-
-# Stopwords and punctuation
-STOPWORDS = set(stopwords.words('english'))
-PUNCTUATION = set(string.punctuation)
-
-def preprocess_text(text):
-    """Enhanced text preprocessing for better semantic understanding"""
-    text = text.lower()
-    # Preserve important technical terms and compound words
-    text = re.sub(r'[^\w\s\-\+\#]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
-
-async def extract_dynamic_keywords(job_description, context="job"):
-    """Use Gemini to dynamically extract the most critical keywords from job description"""
-    try:
-        keyword_extraction_prompt = f"""You are an expert ATS (Applicant Tracking System) specialist and recruitment consultant. Your task is to extract ALL the critical and essential keywords from this job posting that would be used by ATS systems and hiring managers to filter candidates.
+from utils.gemini_client import get_gemini_response_async, stream_gemini_response, gemini_client
+from utils.documents import ResumeDocument, JobDocument
+from utils.warmup import warmup, ResourceNotReady
+from utils.inference import inference_executor, InferenceOverloaded
+from utils.embeddings import embed_sentences, unit_vector
+from utils.tfidf_model import load_tfidf_model, cosine_rows
+from utils.keyword_matcher import match_keywords
+from utils.keyword_extractor import extract_local_keywords
+from utils.keyword_cache import job_keyword_cache
+from utils.pipeline import StagePipeline
+
+# How job keywords are extracted: local | refine | race | llm (see extract_dynamic_keywords)
+KEYWORD_EXTRACTION_MODE = os.getenv("KEYWORD_EXTRACTION_MODE", "race")
+KEYWORD_LLM_DEADLINE_SECONDS = float(os.getenv("KEYWORD_LLM_DEADLINE_SECONDS", "2.5"))
+# Bump whenever the keyword extraction prompt changes, so cached keywords
+# produced by the old prompt are no longer used
+KEYWORD_PROMPT_VERSION = "1"
+
+# LLM extractions still running (e.g. after a race deadline)
+_background_tasks = set()
+
+# Heavy resources are loaded by the warm-up registry (in the background once
+# the app starts) rather than at import time, so importing this module is cheap.
+# The embedding model is registered by utils.embeddings.
+
+def _load_tfidf():
+    model = load_tfidf_model()
+    model.transform(["warm up the vectorizer"])
+    return model
+
+warmup.register("tfidf", _load_tfidf)
+
+def get_tfidf_model():
+    return warmup.get("tfidf")
+
+async def extract_llm_keywords(job_description):
+    """Use Gemini to dynamically extract the most critical keywords from job description.
+
+    Returns None when the model gives no usable answer.
+    """
+    keyword_extraction_prompt = f"""You are an expert ATS (Applicant Tracking System) specialist and recruitment consultant. Your task is to extract ALL the critical and essential keywords from this job posting that would be used by ATS systems and hiring managers to filter candidates.
 
 JOB POSTING:
 {job_description}
@@ -64,23 +80,85 @@ Python, React, AWS, Salesforce, machine learning, project management, SQL, Docke
 
 YOUR EXTRACTED KEYWORDS:"""
 
-        response = get_gemini_response(keyword_extraction_prompt)
+    response = await get_gemini_response_async(keyword_extraction_prompt)
+    
+    if not response or not response.strip():
+        return None
+    
+    # Parse the comma-separated keywords
+    keywords = [kw.strip().lower() for kw in response.split(',') if kw.strip()]
+    # Remove duplicates while preserving order and limit to top 20
+    seen = set()
+    unique_keywords = []
+    for kw in keywords:
+        if kw not in seen and len(kw) > 1:
+            seen.add(kw)
+            unique_keywords.append(kw)
+    
+    return unique_keywords[:20] or None
+
+def _keywords_key(job_description):
+    return job_keyword_cache.make_key(job_description, KEYWORD_PROMPT_VERSION, gemini_client.model)
+
+def _remember_llm_keywords(key, task):
+    """Cache an LLM extraction's result for later requests with the same job description"""
+    _background_tasks.discard(task)
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        print(f"Background keyword extraction failed: {task.exception()}")
+        return
+    if task.result():
+        # The SQLite write runs on a worker thread, off the event loop
+        job_keyword_cache.put_nowait(key, task.result())
+
+def _start_llm_extraction(job_description, key):
+    task = asyncio.ensure_future(extract_llm_keywords(job_description))
+    _background_tasks.add(task)
+    task.add_done_callback(lambda done: _remember_llm_keywords(key, done))
+    return task
+
+async def extract_dynamic_keywords(job_description, context="job", mode=None):
+    """Critical keywords of a job description according to KEYWORD_EXTRACTION_MODE.
+
+    LLM keywords are cached (see utils.keyword_cache), so a job description
+    seen before skips the LLM in every mode but local.
+
+    local:  the local extractor only (a few milliseconds, no LLM call)
+    refine: local keywords now; the LLM refines them in the background and
+            later requests for the same job description get the LLM keywords
+    race:   wait up to KEYWORD_LLM_DEADLINE_SECONDS for the LLM, otherwise use
+            the local keywords (a late LLM answer is still kept for next time)
+    llm:    wait for the LLM; local keywords only if it fails
+    """
+    mode = mode or KEYWORD_EXTRACTION_MODE
+    if mode == "local":
+        return extract_local_keywords(job_description)
+
+    key = _keywords_key(job_description)
+    cached = await job_keyword_cache.get_async(key)
+    if cached:
+        return cached
+
+    try:
+        if mode == "refine":
+            _start_llm_extraction(job_description, key)
+            return extract_local_keywords(job_description)
         
-        if response and response.strip():
-            # Parse the comma-separated keywords
-            keywords = [kw.strip().lower() for kw in response.split(',') if kw.strip()]
-            # Remove duplicates while preserving order and limit to top 15
-            seen = set()
-            unique_keywords = []
-            for kw in keywords:
-                if kw not in seen and len(kw) > 1:
-                    seen.add(kw)
-                    unique_keywords.append(kw)
-            
-            return unique_keywords[:20]
+        if mode == "race":
+            task = _start_llm_extraction(job_description, key)
+            try:
+                keywords = await asyncio.wait_for(asyncio.shield(task), KEYWORD_LLM_DEADLINE_SECONDS)
+            except asyncio.TimeoutError:
+                print(f"Keyword LLM missed its {KEYWORD_LLM_DEADLINE_SECONDS}s deadline, using local keywords")
+                keywords = None
         else:
-            print("Failed to extract keywords via Gemini, using fallback")
-            return extract_fallback_keywords(job_description)
+            keywords = await _start_llm_extraction(job_description, key)
+        
+        if keywords:
+            return keywords
+        print("Failed to extract keywords via Gemini, using fallback")
+        return extract_fallback_keywords(job_description)
             
     except Exception as e:
         print(f"Error in dynamic keyword extraction: {e}")
@@ -88,144 +166,123 @@ YOUR EXTRACTED KEYWORDS:"""
 
 def extract_fallback_keywords(job_description):
     """Fallback keyword extraction using text analysis"""
-    text = preprocess_text(job_description)
-    words = text.split()
-    
-    # Look for common technical and professional terms
-    important_patterns = [
-        r'\b\w*python\w*\b', r'\b\w*java\w*\b', r'\b\w*react\w*\b', r'\b\w*sql\w*\b',
-        r'\b\w*aws\w*\b', r'\b\w*cloud\w*\b', r'\b\w*api\w*\b', r'\b\w*database\w*\b',
-        r'\b\w*management\w*\b', r'\b\w*analysis\w*\b', r'\b\w*development\w*\b',
-        r'\b\w*experience\w*\b', r'\b\w*degree\w*\b', r'\b\w*years\w*\b'
-    ]
-    
-    keywords = []
-    for pattern in important_patterns:
-        matches = re.findall(pattern, text)
-        keywords.extend(matches)
-    
-    return list(set(keywords))[:12]
-
-def find_matching_keywords(resume_text, job_keywords):
-    """Find which keywords from job are present in resume with comprehensive matching"""
-    resume_lower = preprocess_text(resume_text)
-    # Also keep original resume text for exact matching
-    resume_original = resume_text.lower()
-    
-    matched = []
-    missing = []
-    
-    for keyword in job_keywords:
-        keyword_clean = keyword.strip().lower()
-        
-        # Create multiple variants to check
-        keyword_variants = [
-            keyword_clean,
-            keyword_clean.replace(' ', ''),
-            keyword_clean.replace('-', ' '),
-            keyword_clean.replace('_', ' '),
-            keyword_clean.replace('.', ''),
-            keyword_clean.replace('+', 'plus'),
-            keyword_clean.replace('#', 'sharp'),
-            keyword_clean.replace('&', 'and')
-        ]
-        
-        # Also add word boundary checks for exact matches
-        exact_patterns = [
-            r'\b' + re.escape(keyword_clean) + r'\b',
-            r'\b' + re.escape(keyword_clean.replace(' ', '')) + r'\b' if ' ' in keyword_clean else None,
-            r'\b' + re.escape(keyword_clean.replace(' ', '-')) + r'\b' if ' ' in keyword_clean else None
-        ]
-        exact_patterns = [p for p in exact_patterns if p is not None]
-        
-        found = False
-        
-        # Check variants in processed text
-        for variant in keyword_variants:
-            if variant in resume_lower or variant in resume_original:
-                matched.append(keyword.strip())
-                found = True
-                break
-        
-        # If not found, check with regex patterns for exact matches
-        if not found:
-            for pattern in exact_patterns:
-                if re.search(pattern, resume_original):
-                    matched.append(keyword.strip())
-                    found = True
-                    break
-        
-        if not found:
-            missing.append(keyword.strip())
-    
-    return matched, missing
-
-def calculate_semantic_similarity(resume_text, job_description):
-    """Calculate deep semantic similarity using sentence transformers"""
+    return extract_local_keywords(job_description)
+
+def find_matching_keywords(resume_doc, job_keywords):
+    """Find which keywords from job are present in resume with comprehensive matching.
+
+    All spelling variants of all keywords are matched in one pass over the
+    normalized resume (see utils.keyword_matcher).
+    """
+    matches = match_keywords(resume_doc.normalized, job_keywords, resume_doc.tokens, all_spans=False)
+    return matches.matched, matches.missing
+
+# Requirement-to-evidence cosines at or below the first value count as no
+# coverage, at or above the second as full coverage (typical MiniLM range for
+# unrelated vs. paraphrased sentences)
+EVIDENCE_MIN_SIMILARITY = 0.2
+EVIDENCE_FULL_SIMILARITY = 0.7
+
+# Sentence embeddings of both documents, kept for requirement alignment
+DocumentEmbeddings = namedtuple("DocumentEmbeddings", "similarity resume_sentences resume_embeddings")
+# Texts pooled into each side's embedding; by_sentence is False for the whole-text fallback
+SemanticTexts = namedtuple("SemanticTexts", "resume job by_sentence")
+
+def semantic_texts(resume_doc, job_doc):
+    """What the semantic similarity of a resume/job pair embeds, on every endpoint.
+
+    Both documents' sentences when each has some; when either has none, both
+    whole texts (and requirement coverage stays neutral), so a pair scores the
+    same under /upload-resume, /rank and /match-jobs.
+    """
+    # Sentences were split once when the documents were built
+    resume_sentences = resume_doc.sentences_longer_than(20)
+    job_sentences = job_doc.sentences_longer_than(20)
+    if resume_sentences and job_sentences:
+        return SemanticTexts(resume_sentences, job_sentences, True)
+    return SemanticTexts([resume_doc.raw], [job_doc.raw], False)
+
+async def calculate_semantic_similarity(resume_doc, job_doc):
+    """Cosine similarity of the pooled sentence embeddings of resume and job description"""
     try:
-        # Split texts into sentences for better semantic understanding
-        resume_sentences = [s.strip() for s in re.split(r'[.!?]+', resume_text) if len(s.strip()) > 20]
-        job_sentences = [s.strip() for s in re.split(r'[.!?]+', job_description) if len(s.strip()) > 20]
+        texts = semantic_texts(resume_doc, job_doc)
         
-        if not resume_sentences or not job_sentences:
-            # Fallback to full text comparison
-            resume_embedding = semantic_model.encode([resume_text])
-            job_embedding = semantic_model.encode([job_description])
-        else:
-            # Create embeddings for sentences
-            resume_embeddings = semantic_model.encode(resume_sentences)
-            job_embeddings = semantic_model.encode(job_sentences)
-            
-            # Get average embeddings
-            resume_embedding = np.mean(resume_embeddings, axis=0).reshape(1, -1)
-            job_embedding = np.mean(job_embeddings, axis=0).reshape(1, -1)
+        # Repeated (or already cached) sentences are encoded once at most
+        embeddings = await embed_sentences(texts.resume + texts.job)
+        resume_embeddings = embeddings[:len(texts.resume)]
+        job_embeddings = embeddings[len(texts.resume):]
         
-        # Calculate cosine similarity
-        similarity = cosine_similarity(resume_embedding, job_embedding)[0][0]
-        
-        return float(similarity)
+        # Average embeddings, rescaled to unit length, so cosine is a dot product
+        similarity = float(np.dot(unit_vector(resume_embeddings.mean(axis=0)), unit_vector(job_embeddings.mean(axis=0))))
+        if not texts.by_sentence:
+            # Whole-text comparison; nothing to align
+            return DocumentEmbeddings(similarity, [], None)
+        return DocumentEmbeddings(similarity, texts.resume, resume_embeddings)
         
+    except (InferenceOverloaded, ResourceNotReady):
+        # Backpressure and warm-up must reach the route (503), not become a score
+        raise
     except Exception as e:
         print(f"Error in semantic similarity calculation: {e}")
-        return 0.5  # Neutral fallback
+        return DocumentEmbeddings(0.5, [], None)  # Neutral fallback
 
-def calculate_content_overlap_score(resume_text, job_description):
-    """Calculate how much of the job requirements are covered in the resume"""
+async def embed_requirements(requirements):
+    """Embeddings of the requirement texts (None when there are none or encoding fails)"""
+    if not requirements:
+        return None
     try:
-        # Extract key requirements and responsibilities from job description
-        job_requirements = extract_job_requirements(job_description)
-        resume_content = preprocess_text(resume_text)
-        
-        if not job_requirements:
-            return 0.5
-        
-        coverage_score = 0
-        total_weight = 0
-        
-        for requirement, weight in job_requirements:
-            requirement_words = requirement.lower().split()
-            requirement_coverage = 0
-            
-            # Check how well this requirement is covered in resume
-            for word in requirement_words:
-                if word in resume_content:
-                    requirement_coverage += 1
-            
-            if requirement_words:
-                requirement_score = requirement_coverage / len(requirement_words)
-                coverage_score += requirement_score * weight
-                total_weight += weight
-        
-        return coverage_score / total_weight if total_weight > 0 else 0.5
-        
+        return await embed_sentences([text for text, _ in requirements])
+    except (InferenceOverloaded, ResourceNotReady):
+        raise
     except Exception as e:
-        print(f"Error in content overlap calculation: {e}")
-        return 0.5
+        print(f"Error embedding job requirements: {e}")
+        return None
 
-def extract_job_requirements(job_description):
+def align_requirements(requirements, requirement_embeddings, resume_sentences, resume_embeddings):
+    """Weighted coverage of the job requirements and the best resume evidence for each.
+
+    Builds the requirement x resume-sentence cosine matrix in one matmul and
+    takes the best-matching resume sentence per requirement.
+    """
+    if not requirements:
+        return 0.5, []
+    
+    scores = requirement_embeddings @ resume_embeddings.T
+    best = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(requirements)), best]
+    
+    coverage = float(requirement_coverage(best_scores, requirements))
+    
+    return coverage, evidence_pairs(requirements, resume_sentences, best, best_scores)
+
+def evidence_pairs(requirements, resume_sentences, best_index, best_scores):
+    """Each requirement with its best-matching resume sentence and score"""
+    return [
+        {
+            "requirement": text,
+            "evidence": resume_sentences[index],
+            "score": round(float(score), 3),
+            "weight": weight
+        }
+        for (text, weight), index, score in zip(requirements, best_index, best_scores)
+    ]
+
+def requirement_coverage(best_scores, requirements):
+    """Weighted share of the requirements covered, given each requirement's best evidence score.
+
+    `best_scores` has one row per requirement; extra columns (one per resume)
+    give one coverage value per column.
+    """
+    weights = np.array([weight for _, weight in requirements], dtype=np.float32)
+    covered = np.clip(
+        (best_scores - EVIDENCE_MIN_SIMILARITY) / (EVIDENCE_FULL_SIMILARITY - EVIDENCE_MIN_SIMILARITY), 0.0, 1.0
+    )
+    return weights @ covered / weights.sum()
+
+def extract_job_requirements(job_doc):
     """Extract weighted requirements from job description"""
     requirements = []
-    text_lower = job_description.lower()
+    text_lower = job_doc.lower
     
     # High priority indicators
     high_priority_patterns = [
@@ -243,86 +300,162 @@ def extract_job_requirements(job_description):
         r'responsibilities?:?\s*([^.!?\n]+)'
     ]
     
+    # Report requirements in the posting's own casing when offsets line up
+    # (lower() can change the length of some non-ASCII text)
+    source = job_doc.raw if len(job_doc.raw) == len(text_lower) else text_lower
+    
     # Extract high priority requirements
     for pattern in high_priority_patterns:
-        matches = re.findall(pattern, text_lower)
-        for match in matches:
-            if len(match.strip()) > 10:
-                requirements.append((match.strip(), 1.0))
+        for match in re.finditer(pattern, text_lower):
+            requirement = source[match.start(1):match.end(1)].strip()
+            if len(requirement) > 10:
+                requirements.append((requirement, 1.0))
     
     # Extract medium priority requirements
     for pattern in medium_priority_patterns:
-        matches = re.findall(pattern, text_lower)
-        for match in matches:
-            if len(match.strip()) > 10:
-                requirements.append((match.strip(), 0.6))
+        for match in re.finditer(pattern, text_lower):
+            requirement = source[match.start(1):match.end(1)].strip()
+            if len(requirement) > 10:
+                requirements.append((requirement, 0.6))
     
     # If no structured requirements found, extract key sentences
     if not requirements:
-        sentences = [s.strip() for s in re.split(r'[.!?]+', job_description) if len(s.strip()) > 30]
+        sentences = job_doc.sentences_longer_than(30)
         for sentence in sentences[:10]:  # Take first 10 meaningful sentences
             requirements.append((sentence, 0.3))
     
     return requirements[:15]  # Limit to top 15 requirements
 
-def calculate_advanced_similarity(resume_text, job_description, matched_keywords, missing_keywords):
-    """Calculate comprehensive similarity using multiple advanced methods"""
+def tfidf_vectors(texts):
+    """TF-IDF rows for `texts`; runs on the inference executor"""
+    return get_tfidf_model().transform(texts)
+
+def calculate_tfidf_similarity(resume_doc, job_doc):
+    """TF-IDF cosine similarity of the two raw texts under the pre-fitted model"""
     try:
-        print("=== CALCULATING ADVANCED SIMILARITY ===")
-        
-        # Method 1: Semantic similarity using sentence transformers (40% weight)
-        semantic_sim = calculate_semantic_similarity(resume_text, job_description)
-        print(f"Semantic similarity: {semantic_sim:.3f}")
-        
-        # Method 2: Content overlap analysis (30% weight)
-        content_overlap = calculate_content_overlap_score(resume_text, job_description)
-        print(f"Content overlap: {content_overlap:.3f}")
-        
-        # Method 3: TF-IDF similarity (15% weight)
-        try:
-            vectorizer = TfidfVectorizer(ngram_range=(1, 3), max_features=1000, stop_words='english')
-            vectors = vectorizer.fit_transform([resume_text, job_description])
-            tfidf_sim = cosine_similarity(vectors[0], vectors[1])[0][0]
-        except:
-            tfidf_sim = 0.5
-        print(f"TF-IDF similarity: {tfidf_sim:.3f}")
-        
-        # Method 4: Dynamic keyword overlap (15% weight)
-        total_keywords = len(matched_keywords) + len(missing_keywords)
-        if total_keywords > 0:
-            keyword_overlap = len(matched_keywords) / total_keywords
-        else:
-            keyword_overlap = 0.5
-        print(f"Keyword overlap: {keyword_overlap:.3f}")
-        
-        # Weighted combination
-        final_similarity = (
-            semantic_sim * 0.60 +
-            content_overlap * 0.20 +
-            tfidf_sim * 0.10 +
-            keyword_overlap * 0.10
-        ) * 100
-        
-        # Ensure reasonable range with dynamic scaling
-        if final_similarity < 20:
-            final_similarity = 20 + (final_similarity * 0.5)
-        elif final_similarity > 95:
-            final_similarity = 95
-        
-        print(f"Final similarity score: {final_similarity:.1f}%")
-        print("=======================================")
-        
-        return final_similarity
-        
+        return cosine_rows(get_tfidf_model(), resume_doc.raw, job_doc.raw)
+    except (InferenceOverloaded, ResourceNotReady):
+        raise
+    except Exception as e:
+        print(f"Error in TF-IDF similarity calculation: {e}")
+        return 0.5  # Neutral fallback
+
+def keyword_overlap_ratio(matched_keywords, missing_keywords):
+    total_keywords = len(matched_keywords) + len(missing_keywords)
+    if total_keywords > 0:
+        return len(matched_keywords) / total_keywords
+    return 0.5
+
+def combine_scores(semantic_sim, content_overlap, tfidf_sim, keyword_overlap):
+    """Weighted combination of the four methods as a 20-95 percentage"""
+    final_similarity = (
+        semantic_sim * 0.60 +
+        content_overlap * 0.20 +
+        tfidf_sim * 0.10 +
+        keyword_overlap * 0.10
+    ) * 100
+    
+    # Ensure reasonable range with dynamic scaling
+    if final_similarity < 20:
+        final_similarity = 20 + (final_similarity * 0.5)
+    elif final_similarity > 95:
+        final_similarity = 95
+    return final_similarity
+
+# Inputs shared by every stage of the match pipeline
+MatchInputs = namedtuple("MatchInputs", "resume_text job_description resume_doc job_doc")
+
+# Score used when the final combination itself fails
+FALLBACK_SIMILARITY_SCORE = 45.0
+# Suggestions shorter than this are retried (and flagged when streamed)
+MIN_SUGGESTION_CHARS = 200
+
+async def _requirements_stage(match):
+    try:
+        return await inference_executor.run(extract_job_requirements, match.job_doc)
+    except InferenceOverloaded:
+        raise
+    except Exception as e:
+        print(f"Error extracting job requirements: {e}")
+        return []  # No requirements: alignment falls back to neutral coverage
+
+async def _align_stage(match, requirements, requirement_embeddings, documents):
+    if requirement_embeddings is None or not documents.resume_sentences:
+        return 0.5, []
+    try:
+        return await inference_executor.run(
+            align_requirements, requirements, requirement_embeddings,
+            documents.resume_sentences, documents.resume_embeddings
+        )
+    except InferenceOverloaded:
+        raise
+    except Exception as e:
+        print(f"Error aligning job requirements: {e}")
+        return 0.5, []  # Neutral fallback
+
+def _score_stage(match, documents, alignment, tfidf_sim, keyword_match):
+    """Combine the four methods into the final similarity score"""
+    try:
+        return _combine_stage_results(documents, alignment, tfidf_sim, keyword_match)
     except Exception as e:
         print(f"Error in advanced similarity calculation: {e}")
-        return 45.0  # Fallback score
+        return FALLBACK_SIMILARITY_SCORE
 
-async def calculate_match(resume_text, job_description):
-    """Enhanced matching calculation with semantic analysis and AI-powered suggestions"""
+def _combine_stage_results(documents, alignment, tfidf_sim, keyword_match):
+    semantic_sim, (content_overlap, _) = documents.similarity, alignment
+    matched_keywords, missing_keywords = keyword_match
+    print("=== CALCULATING ADVANCED SIMILARITY ===")
     
-    print("=== STARTING ENHANCED MATCH CALCULATION ===")
+    # Method 1: Semantic similarity using sentence transformers
+    print(f"Semantic similarity: {semantic_sim:.3f}")
+    
+    # Method 2: Requirement coverage by best-matching resume evidence
+    print(f"Requirement coverage: {content_overlap:.3f}")
+    
+    # Method 3: TF-IDF similarity
+    print(f"TF-IDF similarity: {tfidf_sim:.3f}")
+    
+    # Method 4: Dynamic keyword overlap
+    keyword_overlap = keyword_overlap_ratio(matched_keywords, missing_keywords)
+    print(f"Keyword overlap: {keyword_overlap:.3f}")
     
+    final_similarity = combine_scores(semantic_sim, content_overlap, tfidf_sim, keyword_overlap)
+    
+    print(f"Final similarity score: {final_similarity:.1f}%")
+    print("=======================================")
+    return final_similarity
+
+def _suggestions_stage(match, similarity_score, keyword_match):
+    matched_keywords, missing_keywords = keyword_match
+    return generate_suggestions(match.job_description, match.resume_text, similarity_score, matched_keywords, missing_keywords)
+
+# calculate_match as a dependency graph: the embedding, TF-IDF, requirement
+# and keyword branches run concurrently, and only the score waits for all of
+# them. CPU-bound stages (keyword matching, requirement extraction, alignment,
+# TF-IDF) run on the inference executor, not the event loop.
+#
+# Failure contract: every stage of the score branch degrades on its own, as
+# calculate_advanced_similarity did as a whole (neutral 0.5 for a failed
+# method, FALLBACK_SIMILARITY_SCORE if combining fails), so one broken method
+# does not fail the match. InferenceOverloaded and ResourceNotReady are not
+# caught: they cancel the run and reach the route as a 503.
+# The streaming endpoint runs the scoring stages and streams suggestions itself.
+scoring_pipeline = (
+    StagePipeline("scoring")
+    .add("keywords", lambda match: extract_dynamic_keywords(match.job_description))
+    .add("keyword_match", lambda match, keywords: inference_executor.run(find_matching_keywords, match.resume_doc, keywords),
+         deps=("keywords",))
+    .add("embeddings", lambda match: calculate_semantic_similarity(match.resume_doc, match.job_doc))
+    .add("requirements", _requirements_stage)
+    .add("requirement_embeddings", lambda match, requirements: embed_requirements(requirements), deps=("requirements",))
+    .add("alignment", _align_stage, deps=("requirements", "requirement_embeddings", "embeddings"))
+    .add("tfidf", lambda match: inference_executor.run(calculate_tfidf_similarity, match.resume_doc, match.job_doc))
+    .add("score", _score_stage, deps=("embeddings", "alignment", "tfidf", "keyword_match"))
+)
+match_pipeline = scoring_pipeline.extend("match").add("suggestions", _suggestions_stage, deps=("score", "keyword_match"))
+
+def prepare_match_inputs(resume_text, job_description):
+    """Validate both texts and build the documents every match stage reads"""
     # Validate inputs
     if not resume_text or not job_description:
         raise ValueError("Resume text and job description cannot be empty")
@@ -335,22 +468,42 @@ async def calculate_match(resume_text, job_description):
     
     print(f"Resume text length: {len(resume_text)}")
     print(f"Job description length: {len(job_description)}")
+
+    # Normalize, tokenize and sentence-split each text once for all stages
+    resume_doc = ResumeDocument.from_text(resume_text)
+    job_doc = JobDocument.from_text(job_description)
+    return MatchInputs(resume_text, job_description, resume_doc, job_doc)
+
+async def calculate_match(resume_text, job_description):
+    """Enhanced matching calculation with semantic analysis and AI-powered suggestions"""
     
-    # Extract dynamic keywords using Gemini
-    print("=== EXTRACTING DYNAMIC KEYWORDS ===")
-    job_keywords = await extract_dynamic_keywords(job_description)
-    print(f"Extracted {len(job_keywords)} critical keywords: {job_keywords}")
-    
-    # Find matching and missing keywords
-    matched_keywords, missing_keywords = find_matching_keywords(resume_text, job_keywords)
+    print("=== STARTING ENHANCED MATCH CALCULATION ===")
     
-    # Calculate advanced similarity score using multiple methods
-    similarity_score = calculate_advanced_similarity(resume_text, job_description, matched_keywords, missing_keywords)
+    results, timings = await match_pipeline.run(prepare_match_inputs(resume_text, job_description))
+    matched_keywords, missing_keywords = results["keyword_match"]
+    similarity_score = results["score"]
+    suggestions = results["suggestions"]
     
+    print(f"Extracted {len(results['keywords'])} critical keywords: {results['keywords']}")
     print(f"Similarity score: {similarity_score:.1f}%")
     print(f"Matched keywords: {matched_keywords}")
     print(f"Missing keywords: {missing_keywords}")
-    
+    print(f"Stage timings (ms): {timings}")
+
+    print("=== MATCH CALCULATION COMPLETED ===")
+    print(f"Final suggestions length: {len(suggestions)}")
+
+    return {
+        "similarity_score": round(similarity_score, 1),
+        "matched_keywords": matched_keywords,
+        "missing_keywords": missing_keywords,
+        "suggestion": suggestions,
+        "evidence": results["alignment"][1],
+        "stage_timings_ms": timings
+    }
+
+async def generate_suggestions(job_description, resume_text, similarity_score, matched_keywords, missing_keywords):
+    """AI-powered suggestions from Gemini, with retries and a shorter fallback prompt"""
     # Create comprehensive prompt for Gemini
     prompt = create_detailed_prompt(job_description, resume_text, similarity_score, matched_keywords, missing_keywords)
     
@@ -361,9 +514,9 @@ async def calculate_match(resume_text, job_description):
     for attempt in range(max_retries):
         try:
             print(f"=== GEMINI ATTEMPT {attempt + 1}/{max_retries} ===")
-            suggestions = get_gemini_response(prompt)
+            suggestions = await get_gemini_response_async(prompt)
             
-            if suggestions and len(suggestions.strip()) >= 200:
+            if suggestions and len(suggestions.strip()) >= MIN_SUGGESTION_CHARS:
                 print("✅ Gemini suggestions received successfully")
                 break
             else:
@@ -378,18 +531,55 @@ async def calculate_match(resume_text, job_description):
                 print("Retrying...")
     
     # Final validation
-    if not suggestions or len(suggestions.strip()) < 200:
+    if not suggestions or len(suggestions.strip()) < MIN_SUGGESTION_CHARS:
         raise Exception("Failed to generate adequate AI suggestions after multiple attempts")
+    
+    return suggestions
 
-    print("=== MATCH CALCULATION COMPLETED ===")
-    print(f"Final suggestions length: {len(suggestions)}")
+async def stream_suggestions(job_description, resume_text, similarity_score, matched_keywords, missing_keywords):
+    """generate_suggestions streamed piece by piece as Gemini writes it.
 
-    return {
-        "similarity_score": round(similarity_score, 1),
-        "matched_keywords": matched_keywords,
-        "missing_keywords": missing_keywords,
-        "suggestion": suggestions
-    }
+    The first MIN_SUGGESTION_CHARS characters are held back, so a failed or
+    too-short attempt can still be retried (with the fallback prompt) before
+    anything reaches the caller; once text has been sent a failure is raised
+    instead of starting over. If every attempt is short, the longest one is
+    yielded and the caller should flag it as incomplete.
+    """
+    prompt = create_detailed_prompt(job_description, resume_text, similarity_score, matched_keywords, missing_keywords)
+    max_retries = 3
+    best_short = ""
+    
+    for attempt in range(max_retries):
+        held, held_length, sent = [], 0, False
+        try:
+            print(f"=== GEMINI STREAM ATTEMPT {attempt + 1}/{max_retries} ===")
+            async for text in stream_gemini_response(prompt):
+                if sent:
+                    yield text
+                    continue
+                held.append(text)
+                held_length += len(text)
+                if held_length >= MIN_SUGGESTION_CHARS:
+                    sent = True
+                    yield "".join(held)
+        except Exception as e:
+            if sent:
+                raise
+            print(f"❌ Attempt {attempt + 1} failed: {e}")
+            continue
+        
+        if sent:
+            return
+        short = "".join(held)
+        print(f"❌ Attempt {attempt + 1}: Insufficient suggestions length: {len(short)}")
+        if len(short.strip()) > len(best_short.strip()):
+            best_short = short
+        prompt = create_fallback_prompt(job_description, resume_text, similarity_score, matched_keywords, missing_keywords)
+    
+    if best_short.strip():
+        yield best_short
+        return
+    raise Exception("Failed to generate adequate AI suggestions after multiple attempts")
 
 def create_detailed_prompt(job_description, resume_text, similarity_score, matched_keywords, missing_keywords):
     """Create a comprehensive and detailed prompt for Gemini analysis"""
@@ -4,6 +4,7 @@ import os
 from dotenv import load_dotenv
 import asyncio
 import time
+from utils.singleflight import llm_calls
 
 # Load environment variables
 load_dotenv()
@@ -12,6 +13,11 @@ load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 async def get_openai_response(prompt, model="gpt-3.5-turbo", temperature=0.7, max_retries=2):
+    """OpenAI's answer to `prompt`; identical requests already in flight share one call"""
+    return await llm_calls.run(("openai", model, temperature, prompt), _request_openai_response,
+                               prompt, model, temperature, max_retries)
+
+async def _request_openai_response(prompt, model, temperature, max_retries):
     """Enhanced OpenAI request handler with robust error handling and retry mechanism"""
     
     for retry_count in range(max_retries + 1):
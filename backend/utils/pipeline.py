@@ -0,0 +1,98 @@
+import asyncio
+import inspect
+import threading
+import time
+from collections import deque, namedtuple
+from utils.inference import latency_summary
+
+Stage = namedtuple("Stage", "name fn deps")
+
+
+class StagePipeline:
+    """A small dependency graph of async stages, run as concurrently as the graph allows.
+
+    Each stage is called as `fn(inputs, *results_of_deps)` as soon as its
+    dependencies have finished, and may return a value or an awaitable.
+    Stages must be added after their dependencies, so the graph is acyclic by
+    construction. If any stage fails, the others are cancelled and the error
+    is raised from run().
+    """
+
+    def __init__(self, name, history=1024):
+        self.name = name
+        self._stages = []
+        self._names = set()
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._history = history
+        self.runs = 0
+
+    def add(self, name, fn, deps=()):
+        missing = [dep for dep in deps if dep not in self._names]
+        if missing:
+            raise ValueError(f"Stage '{name}' depends on unknown stages {missing}")
+        if name in self._names:
+            raise ValueError(f"Stage '{name}' is already defined")
+        self._stages.append(Stage(name, fn, tuple(deps)))
+        self._names.add(name)
+        return self
+
+    def extend(self, name):
+        """A new pipeline with this one's stages, to which more stages can be added"""
+        pipeline = StagePipeline(name, self._history)
+        for stage in self._stages:
+            pipeline.add(stage.name, stage.fn, stage.deps)
+        return pipeline
+
+    async def run(self, inputs, on_stage=None):
+        """({stage: result}, {stage: milliseconds, "total": milliseconds}) for one run.
+
+        A stage's time counts from when its dependencies are ready, so the
+        total approaches the slowest chain of stages rather than their sum.
+        `on_stage(name, result, milliseconds)` is called as each stage finishes.
+        """
+        started = time.perf_counter()
+        tasks = {}
+        durations = {}
+
+        async def run_stage(stage):
+            values = [await tasks[dep] for dep in stage.deps]
+            stage_started = time.perf_counter()
+            value = stage.fn(inputs, *values)
+            if inspect.isawaitable(value):
+                value = await value
+            durations[stage.name] = time.perf_counter() - stage_started
+            if on_stage is not None:
+                on_stage(stage.name, value, round(1000 * durations[stage.name], 1))
+            return value
+
+        for stage in self._stages:
+            tasks[stage.name] = asyncio.ensure_future(run_stage(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            # Collect every outcome so no failure goes unretrieved
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        durations["total"] = time.perf_counter() - started
+
+        self._record(durations)
+        timings = {name: round(1000 * seconds, 1) for name, seconds in durations.items()}
+        return {name: task.result() for name, task in tasks.items()}, timings
+
+    def _record(self, durations):
+        with self._lock:
+            self.runs += 1
+            for name, seconds in durations.items():
+                self._durations.setdefault(name, deque(maxlen=self._history)).append(seconds)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pipeline": self.name,
+                "runs": self.runs,
+                "stages": {stage.name: list(stage.deps) for stage in self._stages},
+                "latency": {name: latency_summary(list(samples)) for name, samples in self._durations.items()},
+            }
@@ -0,0 +1,296 @@
+import asyncio
+import os
+from collections import namedtuple
+import numpy as np
+import scipy.sparse
+from utils.documents import ResumeDocument, JobDocument
+from utils.embeddings import embed_sentences, unit_vector
+from utils.inference import inference_executor
+from utils.matcher import (
+    extract_dynamic_keywords, extract_job_requirements, find_matching_keywords, tfidf_vectors,
+    requirement_coverage, evidence_pairs, keyword_overlap_ratio, combine_scores, generate_suggestions,
+    semantic_texts,
+)
+
+# Most resumes one ranking request may contain
+RANK_MAX_RESUMES = int(os.getenv("RANK_MAX_RESUMES", "500"))
+# Most top candidates that can be given LLM suggestions in one ranking
+RANK_MAX_SUGGESTIONS = int(os.getenv("RANK_MAX_SUGGESTIONS", "10"))
+# Most job descriptions one resume can be matched against per request
+MATCH_JOBS_MAX = int(os.getenv("MATCH_JOBS_MAX", "50"))
+
+# Job-description artifacts computed once and reused for every resume
+JobProfile = namedtuple("JobProfile", "doc keywords requirements requirement_embeddings embedding tfidf")
+
+
+def _embedding_texts(doc):
+    """Sentences used for a document's embedding; the whole text when it has none"""
+    return doc.sentences_longer_than(20) or [doc.raw]
+
+
+def build_resume_documents(texts):
+    return [ResumeDocument.from_text(text) for text in texts]
+
+
+def build_job_documents(texts):
+    """JobDocuments of several job descriptions and their requirements, in one executor task"""
+    job_docs = [JobDocument.from_text(text) for text in texts]
+    return job_docs, [extract_job_requirements(doc) for doc in job_docs]
+
+
+def match_keywords_batch(resume_docs, job_keywords):
+    """find_matching_keywords for many resumes in one executor task"""
+    return [find_matching_keywords(doc, job_keywords) for doc in resume_docs]
+
+
+def match_keyword_sets(resume_doc, keyword_sets):
+    """find_matching_keywords of one resume against several jobs' keywords in one executor task"""
+    return [find_matching_keywords(resume_doc, keywords) for keywords in keyword_sets]
+
+
+async def prepare_jobs(job_descriptions):
+    """JobProfiles for several job descriptions: one embedding call and one TF-IDF transform for all"""
+    # Sentence splitting and requirement regexes run on the executor while
+    # the keywords are extracted
+    (job_docs, requirements), keywords = await asyncio.gather(
+        inference_executor.run(build_job_documents, list(job_descriptions)),
+        asyncio.gather(*(extract_dynamic_keywords(text) for text in job_descriptions))
+    )
+    sentences = [_embedding_texts(doc) for doc in job_docs]
+
+    texts = []
+    for job_sentences, job_requirements in zip(sentences, requirements):
+        texts.extend(job_sentences)
+        texts.extend(text for text, _ in job_requirements)
+
+    embeddings, tfidf = await asyncio.gather(
+        embed_sentences(texts),
+        inference_executor.run(tfidf_vectors, [doc.raw for doc in job_docs])
+    )
+
+    profiles = []
+    offset = 0
+    for i, doc in enumerate(job_docs):
+        sentence_rows = embeddings[offset:offset + len(sentences[i])]
+        offset += len(sentences[i])
+        requirement_rows = embeddings[offset:offset + len(requirements[i])]
+        offset += len(requirements[i])
+        profiles.append(JobProfile(
+            doc=doc,
+            keywords=keywords[i],
+            requirements=requirements[i],
+            requirement_embeddings=requirement_rows,
+            embedding=unit_vector(sentence_rows.mean(axis=0)),
+            tfidf=tfidf[i]
+        ))
+    return profiles
+
+
+async def prepare_job(job_description):
+    """Keywords, requirement embeddings, pooled embedding and TF-IDF row of a job description"""
+    profiles = await prepare_jobs([job_description])
+    return profiles[0]
+
+
+async def score_resumes(profile, resume_docs):
+    """Score many resumes against one prepared job with stacked matrix operations.
+
+    All resume sentences go through one embedding call and all resumes through
+    one TF-IDF transform; per-resume values are then read off segment
+    reductions. Returns one result dict per resume, in input order.
+    """
+    pairs = [semantic_texts(doc, profile.doc) for doc in resume_docs]
+    segments = [pair.resume for pair in pairs]
+    lengths = np.array([len(segment) for segment in segments])
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    by_sentence = np.array([pair.by_sentence for pair in pairs])
+    # Resumes compared as whole texts are compared with the job's whole text
+    job_text = [] if by_sentence.all() else [profile.doc.raw]
+
+    embeddings, tfidf_rows, keyword_matches = await asyncio.gather(
+        embed_sentences([sentence for segment in segments for sentence in segment] + job_text),
+        inference_executor.run(tfidf_vectors, [doc.raw for doc in resume_docs]),
+        inference_executor.run(match_keywords_batch, resume_docs, profile.keywords)
+    )
+    if job_text:
+        job_text_embedding, embeddings = embeddings[-1], embeddings[:-1]
+
+    # Semantic similarity: per-resume mean embedding (segment sums rescaled to
+    # unit length) against the job's pooled (or whole-text) embedding
+    sums = np.add.reduceat(embeddings, starts, axis=0)
+    pooled = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+    semantic = pooled @ profile.embedding
+    if job_text:
+        semantic = np.where(by_sentence, semantic, pooled @ job_text_embedding)
+
+    # Requirement coverage: one requirement x (every resume sentence) matrix,
+    # best evidence taken per resume segment; neutral for whole-text pairs
+    alignment = None
+    coverage = np.full(len(resume_docs), 0.5)
+    if profile.requirements:
+        alignment = profile.requirement_embeddings @ embeddings.T
+        coverage = requirement_coverage(np.maximum.reduceat(alignment, starts, axis=1), profile.requirements)
+        coverage = np.where(by_sentence, coverage, 0.5)
+
+    # TF-IDF similarity: sparse (resumes x vocabulary) rows against the job row
+    tfidf = (tfidf_rows @ profile.tfidf.T).toarray().ravel()
+
+    results = []
+    for i, (pair, (matched, missing)) in enumerate(zip(pairs, keyword_matches)):
+        score = combine_scores(float(semantic[i]), float(coverage[i]), float(tfidf[i]), keyword_overlap_ratio(matched, missing))
+
+        evidence = []
+        if alignment is not None and pair.by_sentence:
+            block = alignment[:, starts[i]:starts[i] + lengths[i]]
+            best_index = block.argmax(axis=1)
+            best_scores = block[np.arange(len(best_index)), best_index]
+            evidence = evidence_pairs(profile.requirements, segments[i], best_index, best_scores)
+
+        results.append({
+            "similarity_score": round(score, 1),
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+            "evidence": evidence
+        })
+    return results
+
+
+async def rank_resumes(candidates, job_description, suggestions_top_k=0):
+    """Rank (name, resume_text) candidates against one job description, best first.
+
+    LLM suggestions are generated only for the `suggestions_top_k` best
+    candidates (capped at RANK_MAX_SUGGESTIONS); a failed suggestion is None.
+    """
+    print(f"=== RANKING {len(candidates)} RESUMES ===")
+    profile, resume_docs = await asyncio.gather(
+        prepare_job(job_description),
+        inference_executor.run(build_resume_documents, [text for _, text in candidates])
+    )
+    print(f"Extracted {len(profile.keywords)} critical keywords: {profile.keywords}")
+
+    scored = await score_resumes(profile, resume_docs) if resume_docs else []
+    ranked = sorted(
+        (({"name": name, **result}, text) for (name, text), result in zip(candidates, scored)),
+        key=lambda pair: pair[0]["similarity_score"],
+        reverse=True
+    )
+    for rank, (result, _) in enumerate(ranked, start=1):
+        result["rank"] = rank
+
+    top = ranked[:max(0, min(suggestions_top_k, RANK_MAX_SUGGESTIONS))]
+    suggestions = await asyncio.gather(
+        *(generate_suggestions(job_description, text, result["similarity_score"],
+                               result["matched_keywords"], result["missing_keywords"])
+          for result, text in top),
+        return_exceptions=True
+    )
+    for (result, _), suggestion in zip(top, suggestions):
+        if isinstance(suggestion, Exception):
+            print(f"Suggestions failed for {result['name']}: {suggestion}")
+            suggestion = None
+        result["suggestion"] = suggestion
+
+    return {
+        "job_keywords": profile.keywords,
+        "results": [result for result, _ in ranked]
+    }
+
+
+async def score_jobs(resume_doc, profiles):
+    """Score one resume against many prepared jobs in a single batched pass.
+
+    The resume is embedded and TF-IDF-transformed once; job embeddings,
+    requirement embeddings and TF-IDF rows are stacked so each method is one
+    matrix product. Returns one result dict per job, in input order.
+    """
+    pairs = [semantic_texts(resume_doc, profile.doc) for profile in profiles]
+    sentences = resume_doc.sentences_longer_than(20)
+    # Pairs compared as whole texts need both whole texts embedded
+    whole_text_jobs = [profile.doc.raw for profile, pair in zip(profiles, pairs) if not pair.by_sentence]
+    whole_texts = [resume_doc.raw] + whole_text_jobs if whole_text_jobs else []
+    embeddings, tfidf_row, keyword_matches = await asyncio.gather(
+        embed_sentences(sentences + whole_texts),
+        inference_executor.run(tfidf_vectors, [resume_doc.raw]),
+        inference_executor.run(match_keyword_sets, resume_doc, [profile.keywords for profile in profiles])
+    )
+    sentence_rows, whole_text_rows = embeddings[:len(sentences)], embeddings[len(sentences):]
+
+    # Semantic similarity: (jobs x dim) job embeddings against the resume's,
+    # pooled sentences or whole texts depending on the pair
+    pooled = unit_vector(sentence_rows.mean(axis=0)) if sentences else None
+    job_rows = iter(whole_text_rows[1:])
+    resume_vectors, job_vectors = [], []
+    for profile, pair in zip(profiles, pairs):
+        if pair.by_sentence:
+            resume_vectors.append(pooled)
+            job_vectors.append(profile.embedding)
+        else:
+            resume_vectors.append(whole_text_rows[0])
+            job_vectors.append(next(job_rows))
+    semantic = np.einsum("ij,ij->i", np.vstack(job_vectors), np.vstack(resume_vectors))
+
+    # Requirement coverage: every job's requirements stacked against the
+    # resume's sentences, best evidence per requirement
+    requirement_counts = [len(profile.requirements) for profile in profiles]
+    if sentences and sum(requirement_counts):
+        alignment = np.vstack([profile.requirement_embeddings for profile in profiles]) @ sentence_rows.T
+        best_index = alignment.argmax(axis=1)
+        best_scores = alignment[np.arange(len(best_index)), best_index]
+
+    # TF-IDF similarity: sparse (jobs x vocabulary) rows against the resume row
+    tfidf = (scipy.sparse.vstack([profile.tfidf for profile in profiles]) @ tfidf_row.T).toarray().ravel()
+
+    results = []
+    offset = 0
+    for i, (profile, pair, (matched, missing)) in enumerate(zip(profiles, pairs, keyword_matches)):
+        coverage, evidence = 0.5, []
+        if profile.requirements and pair.by_sentence:
+            rows = slice(offset, offset + requirement_counts[i])
+            coverage = float(requirement_coverage(best_scores[rows], profile.requirements))
+            evidence = evidence_pairs(profile.requirements, sentences, best_index[rows], best_scores[rows])
+        offset += requirement_counts[i]
+
+        score = combine_scores(float(semantic[i]), coverage, float(tfidf[i]), keyword_overlap_ratio(matched, missing))
+        results.append({
+            "similarity_score": round(score, 1),
+            "matched_keywords": matched,
+            "missing_keywords": missing,
+            "evidence": evidence
+        })
+    return results
+
+
+async def rank_jobs(resume_text, job_descriptions, suggest_for=()):
+    """Rank job descriptions for one resume, best match first.
+
+    Results carry each job's input `index`; LLM suggestions are generated only
+    for the job indices in `suggest_for` (a failed suggestion is None).
+    """
+    print(f"=== MATCHING RESUME AGAINST {len(job_descriptions)} JOBS ===")
+    profiles, (resume_doc,) = await asyncio.gather(
+        prepare_jobs(job_descriptions),
+        inference_executor.run(build_resume_documents, [resume_text])
+    )
+    scored = await score_jobs(resume_doc, profiles)
+
+    results = [{"index": index, "job_keywords": profile.keywords, **result}
+               for index, (profile, result) in enumerate(zip(profiles, scored))]
+
+    suggest_for = set(suggest_for)
+    selected = [result for result in results if result["index"] in suggest_for]
+    suggestions = await asyncio.gather(
+        *(generate_suggestions(job_descriptions[result["index"]], resume_text, result["similarity_score"],
+                               result["matched_keywords"], result["missing_keywords"])
+          for result in selected),
+        return_exceptions=True
+    )
+    for result, suggestion in zip(selected, suggestions):
+        if isinstance(suggestion, Exception):
+            print(f"Suggestions failed for job {result['index']}: {suggestion}")
+            suggestion = None
+        result["suggestion"] = suggestion
+
+    results.sort(key=lambda result: result["similarity_score"], reverse=True)
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+    return results
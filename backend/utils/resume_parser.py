@@ -1,24 +1,603 @@
 from PyPDF2 import PdfReader
 from docx import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from collections import namedtuple
+from utils.extraction_pool import (
+    extraction_supervisor, ExtractionTimeout, ExtractionCrashed, EXTRACTION_TIMEOUT_SECONDS,
+)
+from utils.text_cache import resume_text_cache, content_digest, file_digest
+import xml.etree.ElementTree as ET
+import zipfile
+import time
 import os
 import io
 
-def extract_text_from_pdf(contents: bytes):
-    reader = PdfReader(io.BytesIO(contents))
-    text = ''
-    for page in reader.pages:
-        text += page.extract_text() or ''
-    return text
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
 
-def extract_text_from_docx(contents: bytes):
-    doc = Document(io.BytesIO(contents))
-    return '\n'.join([para.text for para in doc.paragraphs])
+try:
+    from pdfminer.high_level import extract_pages as pdfminer_extract_pages
+    from pdfminer.layout import LTTextContainer
+    from pdfminer.pdfpage import PDFPage
+except ImportError:
+    pdfminer_extract_pages = None
 
-def extract_resume_text(contents: bytes, filename: str):
-    ext = os.path.splitext(filename)[1].lower()
+# Bump whenever extraction output changes so stale cache entries are ignored
+PARSER_VERSION = "5"
+
+# Cached text keeps page boundaries so budgets also apply to cache hits
+PAGE_SEPARATOR = '\f'
+
+# Default extraction budgets: the matcher only needs a bounded amount of text,
+# so long documents (publication lists, appendices) are cut off. 0 = unlimited.
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "30000"))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "10"))
+
+# Read DOCX text straight from word/document.xml instead of building the
+# python-docx object model (which remains the fallback)
+DOCX_FAST_PATH = os.getenv("DOCX_FAST_PATH", "1") != "0"
+
+# Number of leading PDF pages inspected for a text layer before extraction
+PRECHECK_PAGES = int(os.getenv("PDF_PRECHECK_PAGES", "3"))
+
+class ResumeParseError(ValueError):
+    """A resume that cannot be parsed, with a machine-readable error code"""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+    def __reduce__(self):
+        # Raised inside extraction workers, so it must survive pickling
+        return (self.__class__, (self.code, str(self)))
+
+# Engines are tried in this order; the next one is used when a document
+# fails to parse or comes back without any text.
+PDF_ENGINE_ORDER = [e.strip() for e in os.getenv("PDF_ENGINES", "pymupdf,pypdf2,pdfminer").split(",") if e.strip()]
+
+# PDFs with at least this many pages are split into page ranges that are
+# extracted concurrently on the extraction pool; shorter resumes are parsed
+# by a single task.
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PARALLEL_PAGE_THRESHOLD", "6"))
+PAGE_WORKERS = int(os.getenv("PAGE_WORKERS", str(extraction_supervisor.workers)))
+
+def _page_ranges(page_count, workers):
+    """Split page indexes into at most `workers` contiguous [start, stop) ranges"""
+    chunks = max(1, min(workers, page_count))
+    size, extra = divmod(page_count, chunks)
+    ranges = []
+    start = 0
+    for i in range(chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+# --- Document sources --------------------------------------------------------
+# Uploads reach the parser either as bytes (small files kept in memory) or as
+# the path of a spooled temp file, so large documents are never copied into RAM
+# just to be wrapped again.
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+def _open_stream(source):
+    """Binary stream over the source; BytesIO shares the buffer of a bytes object"""
+    return open(source, 'rb') if _is_path(source) else io.BytesIO(source)
+
+# --- PDF engines -------------------------------------------------------------
+# Each engine exposes page_count(source) and iter_pages(source, start, stop),
+# the latter yielding one string per page in [start, stop).
+
+def _pymupdf_open(source):
+    if _is_path(source):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+def _pymupdf_page_count(source):
+    with _pymupdf_open(source) as doc:
+        return doc.page_count
+
+def _pymupdf_iter_pages(source, start: int, stop: int):
+    with _pymupdf_open(source) as doc:
+        for i in range(start, stop):
+            yield doc.load_page(i).get_text()
+
+def _pypdf2_page_count(source):
+    with _open_stream(source) as stream:
+        return len(PdfReader(stream).pages)
+
+def _pypdf2_iter_pages(source, start: int, stop: int):
+    with _open_stream(source) as stream:
+        reader = PdfReader(stream)
+        for i in range(start, stop):
+            yield reader.pages[i].extract_text() or ''
+
+def _pdfminer_page_count(source):
+    with _open_stream(source) as stream:
+        return sum(1 for _ in PDFPage.get_pages(stream))
+
+def _pdfminer_iter_pages(source, start: int, stop: int):
+    with _open_stream(source) as stream:
+        for layout in pdfminer_extract_pages(stream, page_numbers=range(start, stop)):
+            yield ''.join(el.get_text() for el in layout if isinstance(el, LTTextContainer))
+
+PdfEngine = namedtuple("PdfEngine", "name available page_count iter_pages")
+
+PDF_ENGINES = {
+    "pymupdf": PdfEngine("pymupdf", fitz is not None, _pymupdf_page_count, _pymupdf_iter_pages),
+    "pypdf2": PdfEngine("pypdf2", True, _pypdf2_page_count, _pypdf2_iter_pages),
+    "pdfminer": PdfEngine("pdfminer", pdfminer_extract_pages is not None, _pdfminer_page_count, _pdfminer_iter_pages),
+}
+
+def available_pdf_engines():
+    """Names of the configured engines that can be imported, in fallback order"""
+    return [name for name in PDF_ENGINE_ORDER if name in PDF_ENGINES and PDF_ENGINES[name].available]
+
+# --- Isolated parse tasks --------------------------------------------------------
+# Anything that opens a document runs as a task on the supervised extraction
+# pool, so a pathological file can be killed at its deadline instead of hanging
+# the API process. The functions below are the task entry points.
+
+def _probe_pdf(engine_name: str, source, precheck: bool):
+    """Run the pre-check (if asked) and return the page count; runs inside a pool worker"""
+    if precheck:
+        precheck_pdf(source)
+    return PDF_ENGINES[engine_name].page_count(source)
+
+def _extract_page_range(engine_name: str, source, start: int, stop: int):
+    """Extract the text of pages [start, stop); runs inside a pool worker"""
+    return list(PDF_ENGINES[engine_name].iter_pages(source, start, stop))
+
+def _task_error(e):
+    if isinstance(e, ExtractionTimeout):
+        return ResumeParseError("extraction_timeout", "This file took too long to process. Please upload a simpler PDF or a DOCX version of your resume.")
+    return ResumeParseError("extraction_failed", "This file could not be processed. Please upload a different copy of your resume.")
+
+def _run_task(budget, fn, *args):
+    """Run a parse task on the extraction pool within the budget's deadline"""
+    if not extraction_supervisor.enabled:
+        return fn(*args)
+    try:
+        return extraction_supervisor.call(fn, *args, deadline=budget.deadline)
+    except (ExtractionTimeout, ExtractionCrashed) as e:
+        print(f"Extraction task {fn.__name__} aborted: {e}")
+        raise _task_error(e)
+
+def _iter_engine_pages(source, engine, start: int, stop: int, parallel, budget):
+    """Yield pages [start, stop) from one engine, in a single task or page-parallel"""
+    if not extraction_supervisor.enabled:
+        yield from engine.iter_pages(source, start, stop)
+        return
+    if not parallel:
+        yield from _run_task(budget, _extract_page_range, engine.name, source, start, stop)
+        return
+
+    # Each worker re-opens the document and handles one page range; ranges are
+    # yielded back in order as they finish. Spooled uploads are passed by path,
+    # so workers never receive the bytes.
+    ranges = [(engine.name, source, start + lo, start + hi) for lo, hi in _page_ranges(stop - start, PAGE_WORKERS)]
+    results = extraction_supervisor.map(_extract_page_range, ranges, budget.deadline)
+    try:
+        for pages in results:
+            yield from pages
+    except (ExtractionTimeout, ExtractionCrashed) as e:
+        print(f"Page range extraction aborted: {e}")
+        raise _task_error(e)
+    finally:
+        # Budget reached or consumer gone: drop ranges that have not started
+        results.close()
+
+def _use_parallel(parallel, page_count):
+    if parallel is None:
+        return PAGE_WORKERS > 1 and page_count >= PARALLEL_PAGE_THRESHOLD
+    return parallel
+
+def extract_pdf_with_engine(source, engine_name: str, parallel=None):
+    """Extract all page text with a single engine, page-parallel for long documents"""
+    budget = ExtractionBudget(timeout=EXTRACTION_TIMEOUT_SECONDS)
+    page_count = _run_task(budget, _probe_pdf, engine_name, source, False)
+    engine = PDF_ENGINES[engine_name]
+    return ''.join(_iter_engine_pages(source, engine, 0, page_count, _use_parallel(parallel, page_count), budget))
+
+# --- PDF pre-check -------------------------------------------------------------
+# Scanned resumes have no text layer, so full extraction would only burn CPU
+# before the route rejects them. Encryption and the absence of fonts on the
+# first pages are detectable from the document structure alone.
+
+def _pymupdf_precheck(source, pages: int):
+    """Return (encrypted, has_fonts, has_images) for the first pages"""
+    with _pymupdf_open(source) as doc:
+        if doc.needs_pass:
+            return True, False, False
+        has_fonts = has_images = False
+        for i in range(min(pages, doc.page_count)):
+            page = doc.load_page(i)
+            has_fonts = has_fonts or bool(page.get_fonts())
+            has_images = has_images or bool(page.get_images())
+            if has_fonts:
+                break
+        return False, has_fonts, has_images
+
+def _pdf_resources_scan(resources, depth=0):
+    """Look for fonts and images in a resource dictionary, following form XObjects"""
+    has_fonts = bool(resources.get('/Font'))
+    has_images = False
+    xobjects = resources.get('/XObject') or {}
+    for name in xobjects:
+        xobject = xobjects[name].get_object()
+        subtype = xobject.get('/Subtype')
+        if subtype == '/Image':
+            has_images = True
+        elif subtype == '/Form' and depth < 2 and '/Resources' in xobject:
+            form_fonts, form_images = _pdf_resources_scan(xobject['/Resources'].get_object(), depth + 1)
+            has_fonts = has_fonts or form_fonts
+            has_images = has_images or form_images
+    return has_fonts, has_images
+
+def _pypdf2_precheck(source, pages: int):
+    with _open_stream(source) as stream:
+        reader = PdfReader(stream)
+        if reader.is_encrypted:
+            try:
+                if not reader.decrypt(''):
+                    return True, False, False
+            except Exception:
+                return True, False, False
+        has_fonts = has_images = False
+        for i in range(min(pages, len(reader.pages))):
+            resources = reader.pages[i].get('/Resources')
+            if resources is None:
+                continue
+            page_fonts, page_images = _pdf_resources_scan(resources.get_object())
+            has_fonts = has_fonts or page_fonts
+            has_images = has_images or page_images
+            if has_fonts:
+                break
+        return False, has_fonts, has_images
+
+def precheck_pdf(source, pages: int = PRECHECK_PAGES):
+    """Reject encrypted and image-only PDFs without extracting any text.
+
+    Raises ResumeParseError with code "encrypted_pdf" or "image_only_pdf".
+    Inconclusive checks (e.g. a malformed file) are left to the engines.
+    """
+    check = _pymupdf_precheck if fitz is not None else _pypdf2_precheck
+    try:
+        encrypted, has_fonts, has_images = check(source, pages)
+    except Exception as e:
+        print(f"PDF pre-check skipped: {e}")
+        return
+
+    if encrypted:
+        raise ResumeParseError("encrypted_pdf", "This PDF is password-protected. Please upload an unlocked copy of your resume.")
+    if not has_fonts and has_images:
+        raise ResumeParseError("image_only_pdf", "This PDF looks like a scanned image with no selectable text. Please upload a text-based PDF or DOCX.")
+
+class ExtractionBudget:
+    """Character/page limits for one extraction, and how much was actually read"""
+
+    def __init__(self, max_chars=None, max_pages=None, timeout=None):
+        self.max_chars = max_chars or None
+        self.max_pages = max_pages or None
+        # Wall-clock deadline for the whole document (time.monotonic() value)
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.total_pages = None
+        self.pages_read = 0
+        self.chars_read = 0
+        self.truncated_by = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(RESUME_MAX_CHARS, RESUME_MAX_PAGES, EXTRACTION_TIMEOUT_SECONDS)
+
+    @property
+    def exhausted(self):
+        if self.max_pages is not None and self.pages_read >= self.max_pages:
+            return True
+        return self.max_chars is not None and self.chars_read >= self.max_chars
+
+    def page_stop(self, page_count):
+        """Last page index (exclusive) worth extracting under the page budget"""
+        self.total_pages = page_count
+        return page_count if self.max_pages is None else min(page_count, self.max_pages)
+
+    def take(self, text):
+        """Account for one page and return the part of it that fits the budget"""
+        if self.max_chars is not None and self.chars_read + len(text) > self.max_chars:
+            text = text[:self.max_chars - self.chars_read]
+            self.truncated_by = "chars"
+        self.pages_read += 1
+        self.chars_read += len(text)
+        return text
+
+    def as_dict(self):
+        return {
+            "max_chars": self.max_chars,
+            "max_pages": self.max_pages,
+            "pages_read": self.pages_read,
+            "total_pages": self.total_pages,
+            "chars_read": self.chars_read,
+            "truncated": self.truncated_by is not None,
+            "truncated_by": self.truncated_by,
+        }
+
+def _iter_pdf_pages(source, budget, parallel=None):
+    """Yield PDF pages lazily, falling back to the next engine on failure or no text.
+
+    An engine that fails part-way is replaced by the next one from the same page.
+    Leading blank pages are held back until some text shows up, so a document
+    one engine reads as empty can be retried from the start by another.
+    """
+    last_error = None
+    completed = False
+    prechecked = False
+    stop = None
+    page_index = 0
+    for engine_name in available_pdf_engines():
+        engine = PDF_ENGINES[engine_name]
+        held_back = []
+        seen_text = page_index > 0
+        try:
+            if stop is None:
+                # The pre-check reads the document structure, not an engine's
+                # output: attempt it once, whether or not this probe succeeds
+                precheck, prechecked = not prechecked, True
+                page_count = _run_task(budget, _probe_pdf, engine_name, source, precheck)
+                stop = budget.page_stop(page_count)
+            use_parallel = _use_parallel(parallel, stop - page_index)
+            pages = _iter_engine_pages(source, engine, page_index, stop, use_parallel, budget)
+            for text in pages:
+                if not seen_text and not text.strip():
+                    held_back.append(text)
+                    continue
+                seen_text = True
+                for page in held_back + [text]:
+                    page_index += 1
+                    yield page
+                held_back = []
+        except ResumeParseError:
+            # Rejected file, timeout or dead worker: another engine won't help
+            raise
+        except Exception as e:
+            print(f"PDF engine {engine_name} failed at page {page_index}: {e}")
+            last_error = e
+            continue
+
+        completed = True
+        if seen_text or stop == 0:
+            return
+        print(f"PDF engine {engine_name} returned no text, trying next engine")
+
+    # Only surface an error when no engine could read the document at all
+    if last_error is not None and not completed:
+        raise ResumeParseError(
+            "unreadable_pdf", "This PDF appears to be damaged and could not be read. Please upload a different copy or a DOCX version of your resume."
+        ) from last_error
+
+def extract_text_from_pdf(source, parallel=None):
+    return ''.join(_iter_pdf_pages(source, ExtractionBudget(timeout=EXTRACTION_TIMEOUT_SECONDS), parallel))
+
+# --- DOCX ----------------------------------------------------------------------
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P, _W_T, _W_TAB, _W_BR, _W_CR = W_NS + 'p', W_NS + 't', W_NS + 'tab', W_NS + 'br', W_NS + 'cr'
+_W_TC, _W_TR, _W_PAGE_BREAK = W_NS + 'tc', W_NS + 'tr', W_NS + 'lastRenderedPageBreak'
+_W_TYPE = W_NS + 'type'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+# Subtrees whose elements are not document text: paragraph properties
+# (w:tabs/w:tab there are tab-stop definitions, not tab characters) and the
+# fallback copy of AlternateContent, which repeats the mc:Choice text
+_SKIPPED_SUBTREES = frozenset((W_NS + 'pPr', MC_NS + 'Fallback'))
+
+def _table_row_text(cells):
+    """One line per table row, cells separated the same way on both DOCX paths"""
+    return ' | '.join(cell for cell in cells if cell)
+
+def extract_text_from_docx(source):
+    """python-docx extraction: body paragraphs and table rows in document order"""
+    with _open_stream(source) as stream:
+        doc = Document(stream)
+    lines = []
+    for child in doc.element.body.iterchildren():
+        if child.tag == _W_P:
+            lines.append(Paragraph(child, doc).text)
+        elif child.tag == W_NS + 'tbl':
+            for row in Table(child, doc).rows:
+                lines.append(_table_row_text(' '.join(p.text for p in cell.paragraphs if p.text) for cell in row.cells))
+    return '\n'.join(lines)
+
+def iter_docx_xml_pages(source):
+    """Stream page text out of word/document.xml with an incremental parser.
+
+    Paragraphs inside tables are included (one line per row). Pages are split
+    on explicit page breaks and on the page breaks Word recorded at last render.
+    """
+    lines = []   # finished lines of the current page
+    runs = []    # text of the paragraph being read
+    rows = []    # stack of open table rows (tables can nest)
+    cells = []   # stack of open table cells, each a list of paragraph texts
+    skipped = 0  # depth inside _SKIPPED_SUBTREES
+
+    def page_break():
+        if runs and not cells:
+            lines.append(''.join(runs))
+            runs.clear()
+        if lines and not cells:
+            page = '\n'.join(lines)
+            lines.clear()
+            return page
+        return None
+
+    with zipfile.ZipFile(_open_stream(source)) as archive:
+        with archive.open('word/document.xml') as xml:
+            for event, elem in ET.iterparse(xml, events=('start', 'end')):
+                tag = elem.tag
+                if tag in _SKIPPED_SUBTREES:
+                    skipped += 1 if event == 'start' else -1
+                    continue
+                if skipped:
+                    continue
+                if event == 'start':
+                    if tag == _W_TR:
+                        rows.append([])
+                    elif tag == _W_TC:
+                        cells.append([])
+                    elif tag == _W_PAGE_BREAK:
+                        page = page_break()
+                        if page is not None:
+                            yield page
+                    continue
+
+                if tag == _W_T:
+                    runs.append(elem.text or '')
+                elif tag == _W_TAB:
+                    runs.append('\t')
+                elif tag == _W_BR and elem.get(_W_TYPE) == 'page':
+                    page = page_break()
+                    if page is not None:
+                        yield page
+                elif tag == _W_BR or tag == _W_CR:
+                    runs.append('\n')
+                elif tag == _W_P:
+                    text = ''.join(runs)
+                    runs.clear()
+                    if cells:
+                        if text:
+                            cells[-1].append(text)
+                    else:
+                        lines.append(text)
+                    elem.clear()
+                elif tag == _W_TC:
+                    cell = ' '.join(cells.pop())
+                    if rows:
+                        rows[-1].append(cell)
+                elif tag == _W_TR:
+                    row = _table_row_text(rows.pop())
+                    if cells:
+                        cells[-1].append(row)
+                    else:
+                        lines.append(row)
+                    elem.clear()
+
+    if lines:
+        yield '\n'.join(lines)
+
+def extract_text_from_docx_xml(source):
+    return '\n'.join(iter_docx_xml_pages(source))
+
+def _docx_pages(source, budget):
+    if DOCX_FAST_PATH:
+        yielded = False
+        try:
+            for page in iter_docx_xml_pages(source):
+                yielded = True
+                yield page
+            return
+        except Exception as e:
+            if yielded:
+                raise
+            print(f"Fast DOCX extraction failed, falling back to python-docx: {e}")
+
+    # python-docx has no notion of pages; the body is treated as a single page
+    budget.page_stop(1)
+    yield extract_text_from_docx(source)
+
+def _docx_pages_task(source, max_chars, max_pages):
+    """Read DOCX pages up to the budget; runs inside a pool worker.
+
+    Returns (pages, more) where `more` says the budget cut the document short.
+    """
+    budget = ExtractionBudget(max_chars, max_pages)
+    pages = list(_budgeted(_docx_pages(source, budget), budget))
+    return pages, budget.truncated_by is not None
+
+def _iter_docx_pages(source, budget):
+    if not extraction_supervisor.enabled:
+        yield from _docx_pages(source, budget)
+        return
+    pages, more = _run_task(budget, _docx_pages_task, source, budget.max_chars, budget.max_pages)
+    yield from pages
+    if more:
+        # Nothing left to read here, but signals _budgeted that the worker
+        # stopped at the budget rather than at the end of the document
+        yield ''
+
+def _iter_document_pages(source, ext: str, budget):
     if ext == '.pdf':
-        return extract_text_from_pdf(contents)
+        return _iter_pdf_pages(source, budget)
     elif ext == '.docx':
-        return extract_text_from_docx(contents)
+        return _iter_docx_pages(source, budget)
     else:
-        raise ValueError("Unsupported file type")
+        raise ResumeParseError("unsupported_file_type", "Unsupported file type")
+
+def _budgeted(pages, budget):
+    """Pass pages through until the budget is used up, recording any truncation"""
+    try:
+        for text in pages:
+            yield budget.take(text)
+            if budget.exhausted:
+                break
+        if budget.truncated_by is None and budget.exhausted:
+            if budget.total_pages is not None:
+                more = budget.pages_read < budget.total_pages
+            else:
+                # Streamed formats don't know their page count up front
+                more = next(pages, None) is not None
+            if more:
+                chars_spent = budget.max_chars is not None and budget.chars_read >= budget.max_chars
+                budget.truncated_by = "chars" if chars_spent else "pages"
+    finally:
+        # Stops the underlying extraction (and any queued page ranges)
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+
+def iter_resume_pages(source, filename: str, budget=None, digest=None):
+    """Yield the resume text page by page, stopping once the extraction budget is spent.
+
+    `source` is the upload bytes or the path of a spooled temp file, and
+    `digest` the SHA-256 of the upload when the caller already computed it
+    while streaming the file in. Pass an ExtractionBudget to set limits and
+    read back what was consumed; by default RESUME_MAX_CHARS/RESUME_MAX_PAGES
+    apply.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if ext not in ('.pdf', '.docx'):
+        raise ResumeParseError("unsupported_file_type", "Unsupported file type. Please upload a PDF or DOCX resume.")
+    if budget is None:
+        budget = ExtractionBudget.from_env()
+    if digest is None:
+        digest = file_digest(source) if _is_path(source) else content_digest(source)
+
+    # Repeat uploads of the same file skip parsing entirely
+    cache_key = resume_text_cache.make_key(digest, f"{PARSER_VERSION}{ext}")
+    cached = resume_text_cache.get(cache_key)
+    if cached is not None:
+        pages = cached.split(PAGE_SEPARATOR)
+        budget.total_pages = len(pages)
+        yield from _budgeted(iter(pages), budget)
+        return
+
+    # Only a complete, untruncated extraction is cached
+    pages = []
+    for text in _budgeted(_iter_document_pages(source, ext, budget), budget):
+        pages.append(text)
+        yield text
+    if budget.truncated_by is None:
+        resume_text_cache.put(cache_key, PAGE_SEPARATOR.join(page.replace(PAGE_SEPARATOR, '\n') for page in pages))
+
+def read_resume_text(source, filename: str, budget=None, digest=None):
+    """Collect iter_resume_pages into one string; returns (text, budget)"""
+    if budget is None:
+        budget = ExtractionBudget.from_env()
+    text = '\n'.join(iter_resume_pages(source, filename, budget, digest))
+    return text, budget
+
+def extract_resume_text(source, filename: str, digest=None):
+    """Extract the full resume text (no size limits, default deadline) from upload bytes or a spooled file path"""
+    text, _ = read_resume_text(source, filename, ExtractionBudget(timeout=EXTRACTION_TIMEOUT_SECONDS), digest)
+    return text
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+
+class SingleFlight:
+    """Coalesces identical concurrent async calls into one.
+
+    The first caller for a key starts the call as its own task; callers that
+    arrive with the same key while it is running await that task instead of
+    starting another, and all of them get its result or its exception.
+    Cancelling one caller does not affect the others; the shared call is only
+    cancelled once every caller has gone, and callers arriving after that
+    start a new call.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    async def run(self, key, fn, *args):
+        """Result of `await fn(*args)`, shared with concurrent callers using the same key"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # In-flight tasks belong to the loop that created them
+            self._loop, self._flights = loop, {}
+
+        flight = self._flights.get(key)
+        with self._lock:
+            self.calls += 1
+            if flight is None:
+                self.upstream_calls += 1
+            else:
+                self.coalesced += 1
+        if flight is None:
+            flight = {"task": asyncio.ensure_future(fn(*args)), "waiters": 0}
+            self._flights[key] = flight
+            flight["task"].add_done_callback(lambda _: self._land(key, flight))
+
+        flight["waiters"] += 1
+        with self._lock:
+            self.max_waiters = max(self.max_waiters, flight["waiters"])
+        try:
+            return await asyncio.shield(flight["task"])
+        except asyncio.CancelledError:
+            if flight["waiters"] == 1 and not flight["task"].done():
+                # Last caller gone: forget the flight in the same step as
+                # cancelling it, so a caller arriving before the cancellation
+                # lands starts a new call instead of inheriting it
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight["task"].cancel()
+            raise
+        finally:
+            flight["waiters"] -= 1
+
+    def _land(self, key, flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        task = flight["task"]
+        if not task.cancelled():
+            # Mark the exception as retrieved even when every caller has gone
+            task.exception()
+
+    def stats(self):
+        flights = list(self._flights.values())
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "upstream_calls": self.upstream_calls,
+                "coalesced": self.coalesced,
+                "coalesced_rate": round(self.coalesced / self.calls, 3) if self.calls else 0.0,
+                "in_flight": len(flights),
+                "waiters": sum(flight["waiters"] for flight in flights),
+                "max_waiters": self.max_waiters,
+            }
+
+
+# Shared coalescing layer in front of the LLM clients
+llm_calls = SingleFlight()
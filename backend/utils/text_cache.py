@@ -0,0 +1,160 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# In-process tier: number of parsed documents kept in memory
+TEXT_CACHE_MEMORY_ITEMS = int(os.getenv("TEXT_CACHE_MEMORY_ITEMS", "256"))
+# On-disk tier: directory and total size budget in bytes
+TEXT_CACHE_DIR = os.getenv(
+    "TEXT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "resume_text"),
+)
+TEXT_CACHE_DISK_BYTES = int(os.getenv("TEXT_CACHE_DISK_BYTES", str(64 * 1024 * 1024)))
+
+
+def content_digest(contents) -> str:
+    """SHA-256 hex digest of the uploaded bytes"""
+    return hashlib.sha256(contents).hexdigest()
+
+
+def file_digest(path, chunk_size=1024 * 1024) -> str:
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedTextCache:
+    """Two-tier (memory LRU + disk) cache of extracted text keyed by content hash"""
+
+    def __init__(self, max_items=TEXT_CACHE_MEMORY_ITEMS, directory=TEXT_CACHE_DIR, disk_budget=TEXT_CACHE_DISK_BYTES):
+        self.max_items = max_items
+        self.directory = directory
+        self.disk_budget = disk_budget
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(digest: str, version: str) -> str:
+        """Combine the content digest with the parser version that produced the text"""
+        return hashlib.sha256(f"{version}\0{digest}".encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            # Touch the file so disk eviction follows recency of use
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+            self._remember(key, text)
+        return text
+
+    def put(self, key, text):
+        with self._lock:
+            self._remember(key, text)
+        try:
+            self._write_disk(key, text)
+        except OSError as e:
+            print(f"Resume text cache write failed: {e}")
+
+    def _remember(self, key, text):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _scan_disk(self):
+        """Return (mtime, size, path) for every cached file on disk"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".txt"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _write_disk(self, key, text):
+        data = text.encode("utf-8")
+        if len(data) > self.disk_budget:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        # Atomic rename so concurrent workers never read a partial file
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+            else:
+                self._disk_bytes += len(data)
+            if self._disk_bytes <= self.disk_budget:
+                return
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Delete least recently used files until the directory fits the budget"""
+        entries = sorted(self._scan_disk())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.disk_budget:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._disk_bytes = total
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "memory_items": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+                "disk_budget_bytes": self.disk_budget,
+                "disk_evictions": self.evictions,
+            }
+
+
+# Shared instance used by the resume parser
+resume_text_cache = ParsedTextCache()
@@ -0,0 +1,173 @@
+"""Pre-fitted TF-IDF model for the lexical similarity stage.
+
+Fit once, offline, on a local corpus of job descriptions and resumes (run from
+the backend directory):
+
+    python -m utils.tfidf_model fit path/to/corpus [more paths] --output models/tfidf.npz
+
+Corpus paths may be files or directories of .txt, .pdf and .docx documents.
+The artifact holds only the vocabulary and IDF weights; requests just
+transform. Without an artifact (or with TFIDF_MODE=hashing) a
+HashingVectorizer is used instead, which needs no fitting but has no IDF.
+"""
+import argparse
+import os
+import time
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# "auto" uses the fitted artifact when present and hashing otherwise;
+# "fitted" requires the artifact; "hashing" never reads it
+TFIDF_MODE = os.getenv("TFIDF_MODE", "auto")
+TFIDF_MODEL_PATH = os.getenv(
+    "TFIDF_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "tfidf.npz"),
+)
+TFIDF_HASHING_FEATURES = int(os.getenv("TFIDF_HASHING_FEATURES", str(2 ** 18)))
+
+NGRAM_RANGE = (1, 3)
+STOP_WORDS = "english"
+CORPUS_EXTENSIONS = (".txt", ".pdf", ".docx")
+
+
+class FittedTfidfModel:
+    """TF-IDF with a fixed vocabulary and IDF learned offline"""
+
+    kind = "fitted"
+
+    def __init__(self, terms, idf, ngram_range=NGRAM_RANGE, stop_words=STOP_WORDS):
+        # A CountVectorizer with a fixed vocabulary needs no fitting; IDF
+        # weighting and L2 normalisation are applied on top
+        self._counts = CountVectorizer(vocabulary=list(terms), ngram_range=tuple(ngram_range), stop_words=stop_words)
+        self.idf = np.asarray(idf, dtype=np.float32)
+
+    @property
+    def vocabulary_size(self):
+        return len(self.idf)
+
+    def transform(self, texts):
+        """L2-normalised TF-IDF rows (sparse), one per text"""
+        counts = self._counts.transform(texts)
+        return normalize(counts.multiply(self.idf).tocsr())
+
+    def save(self, path):
+        terms = self._counts.get_feature_names_out()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(
+            path,
+            terms=np.asarray(terms, dtype=str),
+            idf=self.idf,
+            ngram_range=np.asarray(self._counts.ngram_range),
+            stop_words=np.asarray(self._counts.stop_words or ""),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as artifact:
+            return cls(
+                terms=artifact["terms"].tolist(),
+                idf=artifact["idf"],
+                ngram_range=artifact["ngram_range"].tolist(),
+                stop_words=str(artifact["stop_words"]) or None,
+            )
+
+
+class HashingTfModel:
+    """Stateless hashed term frequencies; used when no fitted artifact is available"""
+
+    kind = "hashing"
+
+    def __init__(self, n_features=TFIDF_HASHING_FEATURES):
+        self._vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=NGRAM_RANGE, stop_words=STOP_WORDS,
+            alternate_sign=False, norm="l2",
+        )
+
+    @property
+    def vocabulary_size(self):
+        return self._vectorizer.n_features
+
+    def transform(self, texts):
+        return self._vectorizer.transform(texts)
+
+
+def load_tfidf_model(path=TFIDF_MODEL_PATH, mode=TFIDF_MODE):
+    """The model used on the request path, per TFIDF_MODE"""
+    if mode == "hashing":
+        return HashingTfModel()
+    if os.path.exists(path):
+        return FittedTfidfModel.load(path)
+    if mode == "fitted":
+        raise FileNotFoundError(f"TF-IDF artifact not found at {path}; run `python -m utils.tfidf_model fit`")
+    print(f"No TF-IDF artifact at {path}; using hashed term frequencies")
+    return HashingTfModel()
+
+
+def cosine_rows(model, first, second):
+    """Cosine similarity between two texts under `model` (rows are L2-normalised)"""
+    vectors = model.transform([first, second])
+    return float(vectors[0].multiply(vectors[1]).sum())
+
+
+def iter_corpus_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(CORPUS_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def read_corpus(paths):
+    """Text of every corpus document; unreadable files are skipped"""
+    from utils.resume_parser import extract_resume_text
+
+    texts = []
+    for path in iter_corpus_files(paths):
+        try:
+            if path.lower().endswith(".txt"):
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    text = f.read()
+            else:
+                text = extract_resume_text(path, os.path.basename(path))
+        except Exception as e:
+            print(f"Skipping {path}: {e}")
+            continue
+        if text.strip():
+            texts.append(text)
+    return texts
+
+
+def fit(paths, output, max_features, min_df):
+    started = time.perf_counter()
+    texts = read_corpus(paths)
+    if len(texts) < 2:
+        raise SystemExit(f"Need at least two readable documents to fit IDF, found {len(texts)}")
+
+    vectorizer = TfidfVectorizer(
+        ngram_range=NGRAM_RANGE, stop_words=STOP_WORDS, max_features=max_features,
+        min_df=min(min_df, len(texts)),
+    )
+    vectorizer.fit(texts)
+    model = FittedTfidfModel(vectorizer.get_feature_names_out(), vectorizer.idf_)
+    model.save(output)
+
+    elapsed = time.perf_counter() - started
+    size_kb = os.path.getsize(output) / 1024
+    print(f"Fitted on {len(texts)} documents in {elapsed:.1f}s: "
+          f"{model.vocabulary_size} terms, {size_kb:.0f} KB -> {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the TF-IDF model used for lexical similarity")
+    commands = parser.add_subparsers(dest="command", required=True)
+    fit_parser = commands.add_parser("fit", help="learn vocabulary and IDF from a local corpus")
+    fit_parser.add_argument("paths", nargs="+", help="files or directories of .txt/.pdf/.docx documents")
+    fit_parser.add_argument("--output", default=TFIDF_MODEL_PATH)
+    fit_parser.add_argument("--max-features", type=int, default=20000)
+    fit_parser.add_argument("--min-df", type=int, default=2, help="drop terms seen in fewer documents")
+    args = parser.parse_args()
+    fit(args.paths, args.output, args.max_features, args.min_df)
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import tempfile
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+# Hard cap on a single uploaded resume
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+# Uploads up to this size stay in memory; larger ones are spooled to a temp file
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Allowance for the non-file form fields (job description etc.) in a request body
+FORM_OVERHEAD_BYTES = 1024 * 1024
+# Whole-body cap for batch ranking requests carrying many resumes
+MAX_RANK_BODY_BYTES = int(os.getenv("MAX_RANK_BODY_BYTES", str(256 * 1024 * 1024)))
+
+
+def upload_too_large(limit):
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large (maximum {limit // (1024 * 1024)} MB allowed)",
+    )
+
+
+class SpooledUpload:
+    """An ingested upload: either in-memory bytes or a file path, plus its SHA-256"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.size = 0
+        self.digest = None
+        self.data = None
+        self.path = None
+        # Whether `path` is our own temp file (removed on close) rather than
+        # the file Starlette spooled the request body to
+        self.owns_path = False
+
+    @property
+    def source(self):
+        """What the resume parser should read: the temp file path or the bytes"""
+        return self.path if self.path is not None else self.data
+
+    def close(self):
+        if self.path is not None and self.owns_path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self.path = None
+        self.data = None
+
+
+def starlette_spool_path(file):
+    """A path any process can open to the temp file Starlette spooled `file` to, or None.
+
+    Multipart parsing already wrote uploads over its memory limit to disk;
+    reading that file in place avoids copying it. POSIX temp files are
+    unlinked, so their open descriptor is reached through /proc.
+    """
+    spool = getattr(file, "file", None)
+    if not getattr(spool, "_rolled", False):
+        return None
+    name = getattr(spool, "name", None)
+    if isinstance(name, str) and os.path.isfile(name):
+        return name
+    try:
+        path = f"/proc/{os.getpid()}/fd/{spool.fileno()}"
+    except (OSError, ValueError, AttributeError):
+        return None
+    return path if os.path.exists(path) else None
+
+
+async def spool_upload(file, max_bytes=MAX_UPLOAD_BYTES, spool_bytes=UPLOAD_SPOOL_BYTES):
+    """Read an UploadFile in chunks, hashing as we go and rejecting it once it exceeds max_bytes.
+
+    Uploads Starlette already spooled to disk are read in place (see
+    starlette_spool_path); others are kept in memory, or copied to a temp
+    file once larger than spool_bytes. Call close() on the result when done.
+    """
+    # Reject straight away when the multipart part already reports its size
+    if getattr(file, "size", None) is not None and file.size > max_bytes:
+        raise upload_too_large(max_bytes)
+
+    upload = SpooledUpload(file.filename)
+    digest = hashlib.sha256()
+    in_place = starlette_spool_path(file)
+    if in_place is not None:
+        # Already on disk: only hash it. The file stays open until FastAPI
+        # closes the form after the response, so it is not closed here.
+        await file.seek(0)
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            upload.size += len(chunk)
+            if upload.size > max_bytes:
+                raise upload_too_large(max_bytes)
+            digest.update(chunk)
+        upload.path = in_place
+        upload.digest = digest.hexdigest()
+        return upload
+
+    chunks = []
+    spool = None
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            upload.size += len(chunk)
+            if upload.size > max_bytes:
+                raise upload_too_large(max_bytes)
+            digest.update(chunk)
+
+            if spool is not None:
+                spool.write(chunk)
+                continue
+            chunks.append(chunk)
+            if upload.size > spool_bytes:
+                # Too big to keep in memory: move what we have to a named temp
+                # file the extraction engines can open by path.
+                suffix = os.path.splitext(file.filename or "")[1].lower()
+                spool = tempfile.NamedTemporaryFile(prefix="resume_", suffix=suffix, delete=False)
+                upload.path = spool.name
+                upload.owns_path = True
+                spool.write(b"".join(chunks))
+                chunks = []
+
+        if spool is None:
+            upload.data = b"".join(chunks)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+        upload.close()
+        raise
+    finally:
+        await file.close()
+
+    if spool is not None:
+        spool.close()
+    upload.digest = digest.hexdigest()
+    return upload
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized request bodies before they are parsed or spooled.
+
+    Requests announcing a larger Content-Length are refused immediately; chunked
+    bodies are counted as they arrive and cut off at the limit.
+    """
+
+    def __init__(self, app, max_body_bytes=MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES, path_limits=None):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.path_limits.get(scope["path"], self.max_body_bytes)
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse(status_code=413, content={"detail": upload_too_large(limit).detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise upload_too_large(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,109 @@
+import threading
+import time
+
+
+class ResourceNotReady(Exception):
+    """A warm-up resource was requested before it finished loading"""
+
+    def __init__(self, name, status):
+        super().__init__(f"Resource '{name}' is not ready ({status})")
+        self.name = name
+        self.status = status
+
+
+class WarmupRegistry:
+    """Loads expensive resources (models, corpora) off the startup path and reports readiness.
+
+    Once start() has been called, loading happens on a background thread and
+    get() fails fast with ResourceNotReady until the resource is available.
+    Without start() (scripts, benchmarks) get() simply loads on first use.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._values = {}
+        self._status = {}
+        self._events = {}
+        self._lock = threading.Lock()
+        self._started = False
+
+    def register(self, name, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._status[name] = {"status": "pending"}
+            self._events[name] = threading.Event()
+
+    def start(self):
+        """Begin loading every registered resource in the background (idempotent)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            names = list(self._loaders)
+        threading.Thread(target=self._load_all, args=(names,), name="warmup", daemon=True).start()
+
+    def _load_all(self, names):
+        for name in names:
+            self._load(name)
+
+    def _load(self, name):
+        with self._lock:
+            if self._status[name]["status"] in ("loading", "ready"):
+                return
+            self._status[name] = {"status": "loading"}
+            self._events[name].clear()
+
+        started = time.perf_counter()
+        try:
+            value = self._loaders[name]()
+        except Exception as e:
+            print(f"❌ Failed to load {name}: {e}")
+            with self._lock:
+                self._status[name] = {"status": "failed", "error": str(e)}
+        else:
+            elapsed = round(time.perf_counter() - started, 2)
+            print(f"✅ {name} ready in {elapsed}s")
+            with self._lock:
+                self._values[name] = value
+                self._status[name] = {"status": "ready", "load_seconds": elapsed}
+        finally:
+            self._events[name].set()
+
+    def get(self, name, wait=None):
+        """Return a loaded resource, optionally waiting up to `wait` seconds for it"""
+        if name in self._values:
+            return self._values[name]
+
+        if not self._started:
+            self._load(name)
+        else:
+            self.retry_failed(name)
+            if wait:
+                self._events[name].wait(wait)
+
+        if name in self._values:
+            return self._values[name]
+        raise ResourceNotReady(name, self._status[name]["status"])
+
+    def retry_failed(self, *names):
+        """Reload failed resources (e.g. an interrupted model download) in the background"""
+        with self._lock:
+            failed = [name for name in (names or self._loaders) if self._status[name]["status"] == "failed"]
+        for name in failed:
+            threading.Thread(target=self._load, args=(name,), name=f"warmup-{name}", daemon=True).start()
+
+    def is_ready(self, *names):
+        """True when the given resources (default: all) are loaded"""
+        return all(name in self._values for name in (names or self._loaders))
+
+    def readiness(self):
+        with self._lock:
+            resources = {name: dict(status) for name, status in self._status.items()}
+        return {
+            "ready": all(status["status"] == "ready" for status in resources.values()),
+            "resources": resources,
+        }
+
+
+# Shared registry; resources are registered by the modules that use them
+warmup = WarmupRegistry()